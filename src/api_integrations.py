@@ -1,69 +1,231 @@
-import requests
-import json
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+import orjson
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
 import os
 from dotenv import load_dotenv
 import time
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from contextlib import nullcontext
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse collected festivals before hitting the APIs again
+FESTIVAL_CACHE_TTL = 600
+
+# Seconds to wait for all sources before returning what has arrived
+SOURCE_FETCH_DEADLINE = 20
+
+# Maximum concurrent Facebook event detail requests
+FACEBOOK_DETAIL_WORKERS = 16
+
+# Accept events from 30 days ago to 90 days in the future
+_VALID_WINDOW_PAST = timedelta(days=30)
+_VALID_WINDOW_FUTURE = timedelta(days=90)
+
+# Category keyword patterns, checked in order; the first match wins
+_CATEGORY_PATTERNS = [
+    ('music', re.compile(r'\b(?:music|concert|jazz|rock|pop|band|singer)s?\b', re.IGNORECASE)),
+    ('film', re.compile(r'\b(?:film|movie|cinema|documentary|screening)s?\b', re.IGNORECASE)),
+    ('food', re.compile(r'\b(?:food|culinary|wine|beer|taste|dining|restaurant)s?\b', re.IGNORECASE)),
+    ('art', re.compile(r'\b(?:art|exhibition|gallery|museum|painting|sculpture)s?\b', re.IGNORECASE)),
+    ('comedy', re.compile(r'\b(?:comedy|standup|humor|laugh|joke)s?\b', re.IGNORECASE)),
+    ('dance', re.compile(r'\b(?:dance|ballet|performance|theatre|theater)s?\b', re.IGNORECASE))
+]
+
+# Simple metro station mapping, checked in order
+_METRO_STATIONS = (
+    ('quartier des spectacles', 'Place-des-Arts'),
+    ('place des arts', 'Place-des-Arts'),
+    ('old port', 'Place-d\'Armes'),
+    ('parc jean-drapeau', 'Jean-Drapeau'),
+    ('quartier latin', 'Berri-UQAM'),
+    ('downtown', 'McGill'),
+    ('plateau', 'Sherbrooke'),
+    ('mile end', 'Laurier')
+)
+
+@lru_cache(maxsize=4096)
+def _nearest_metro_cached(address_lower: str) -> str:
+    """Look up the nearest metro station for a normalized address"""
+    for location, station in _METRO_STATIONS:
+        if location in address_lower:
+            return station
+    
+    return 'Multiple stations'
+
+@dataclass
+class FestivalEvent:
+    """Compact, typed record for an event parsed from an API response"""
+    __slots__ = ('name', 'venue', 'address', 'start_date', 'end_date',
+                 'url', 'source', 'category', 'price', 'metro')
+    
+    name: str
+    venue: str
+    address: str
+    start_date: str
+    end_date: str
+    url: str
+    source: str
+    category: str
+    price: str
+    metro: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the festival dict shape used by the rest of the app"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+# Shared read-only default for missing nested objects
+_EMPTY = {}
+
+def _dig(data: Any, *keys: str) -> Dict[str, Any]:
+    """Walk nested dicts by key, yielding an empty dict for any missing level"""
+    for key in keys:
+        data = data.get(key, _EMPTY) if isinstance(data, dict) else _EMPTY
+    return data if isinstance(data, dict) else _EMPTY
+
 class APIIntegrations:
     def __init__(self):
         """Initialize API integrations"""
-        self.ticketmaster_key = os.getenv('TICKETMASTER_API_KEY')
-        self.eventbrite_token = os.getenv('EVENTBRITE_TOKEN')
-        self.facebook_token = os.getenv('FACEBOOK_ACCESS_TOKEN')
-        self.google_places_key = os.getenv('GOOGLE_PLACES_API_KEY')
-        self.meetup_key = os.getenv('MEETUP_API_KEY')
+        env = os.environ
+        self.ticketmaster_key = env.get('TICKETMASTER_API_KEY')
+        self.eventbrite_token = env.get('EVENTBRITE_TOKEN')
+        self.facebook_token = env.get('FACEBOOK_ACCESS_TOKEN')
+        self.google_places_key = env.get('GOOGLE_PLACES_API_KEY')
+        self.meetup_key = env.get('MEETUP_API_KEY')
         
-        self.session = requests.Session()
+        # Only register sources whose credentials are configured; Quebec Open
+        # Data needs none
+        sources = [
+            ('Ticketmaster', self.ticketmaster_key, self._get_ticketmaster_events),
+            ('Eventbrite', self.eventbrite_token, self._get_eventbrite_events),
+            ('Meetup', self.meetup_key, self._get_meetup_events),
+            ('Facebook', self.facebook_token, self._get_facebook_events),
+            ('Google Places', self.google_places_key, self._get_google_places_events)
+        ]
+        self._fetchers = [fetcher for _, key, fetcher in sources if key]
+        self._fetchers.append(self._get_quebec_open_data)
+        
+        # Long-lived pool for the per-refresh source fan-out, so worker
+        # threads are reused instead of being spawned on every refresh
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._fetchers),
+            thread_name_prefix='festival-api'
+        )
+        
+        disabled = [name for name, key, _ in sources if not key]
+        if disabled:
+            logger.warning("API credentials not found, skipping: %s", ', '.join(disabled))
+        
+        # (timestamp, festivals) from the last successful collection
+        self._cache = None
+        self._cache_ttl = FESTIVAL_CACHE_TTL
+        
+        # Set by invalidate_cache so the next collection skips the HTTP cache
+        self._bypass_http_cache = False
+        
+        # Responses change on the order of hours, so keep them in an on-disk
+        # HTTP cache shared across runs; honor Cache-Control from the APIs and
+        # fall back to stale responses when an API errors
+        self.session = CachedSession(
+            'festival_cache',
+            backend='sqlite',
+            expire_after=FESTIVAL_CACHE_TTL,
+            allowable_methods=('GET',),
+            cache_control=True,
+            stale_if_error=True
+        )
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Pool enough connections for the concurrent fetchers and retry
+        # transient failures without re-running the whole fetch
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def invalidate_cache(self) -> None:
+        """Make the next get_live_festivals call fetch fresh data from every source"""
+        self._cache = None
+        self._bypass_http_cache = True
     
     def get_live_festivals(self) -> List[Dict[str, Any]]:
         """Get live festival data from multiple APIs"""
+        if self._cache and time.monotonic() - self._cache[0] < self._cache_ttl:
+            return self._cache[1]
+        
         festivals = []
         
+        # After invalidate_cache, go past the HTTP cache as well, or the
+        # sources would just replay their cached responses
+        bypass_http_cache, self._bypass_http_cache = self._bypass_http_cache, False
+        
         try:
-            # 1. Ticketmaster Discovery API
-            festivals.extend(self._get_ticketmaster_events())
-            
-            # 2. Eventbrite API
-            festivals.extend(self._get_eventbrite_events())
-            
-            # 3. Meetup API
-            festivals.extend(self._get_meetup_events())
-            
-            # 4. Facebook Events API
-            festivals.extend(self._get_facebook_events())
-            
-            # 5. Google Places API for venues
-            festivals.extend(self._get_google_places_events())
-            
-            # 6. Quebec Open Data
-            festivals.extend(self._get_quebec_open_data())
+            with self.session.cache_disabled() if bypass_http_cache else nullcontext():
+                # The sources are independent and I/O-bound, so fetch them
+                # concurrently: wall time becomes the slowest call, not the sum.
+                fetchers = self._fetchers
+                futures = [self._executor.submit(fetcher) for fetcher in fetchers]
+                
+                # Don't let one slow source gate the rest: wait up to the deadline
+                # and skip whatever has not finished by then
+                done, _ = wait(futures, timeout=SOURCE_FETCH_DEADLINE)
+            
+            # Collect in submission order so results stay deterministic
+            for fetcher, future in zip(fetchers, futures):
+                if future not in done:
+                    logger.warning("%s timed out after %ss, skipping", fetcher.__name__, SOURCE_FETCH_DEADLINE)
+                    continue
+                
+                try:
+                    festivals.extend(future.result())
+                except Exception as e:
+                    logger.error("Error in %s: %s", fetcher.__name__, e)
             
-            # Filter and validate
-            current_date = datetime.now()
+            # Filter and validate (tz-aware, as most APIs return UTC timestamps)
+            current_date = datetime.now(timezone.utc)
             valid_festivals = []
             
-            for festival in festivals:
-                if self._is_valid_festival(festival, current_date):
-                    valid_festivals.append(festival)
+            # Sources often list the same festival; keep the first valid listing
+            # of each (name, start day) so duplicates don't use up result slots.
+            # An invalid listing must not hide a valid one from another source.
+            seen = set()
             
-            logger.info(f"Found {len(valid_festivals)} live festivals from APIs")
-            return valid_festivals[:50]  # Return top 50 festivals
+            for festival in festivals:
+                if not self._is_valid_festival(festival, current_date):
+                    continue
+                key = (festival.name.strip().lower(), (festival.start_date or '')[:10])
+                if key in seen:
+                    continue
+                seen.add(key)
+                valid_festivals.append(festival.to_dict())
+            
+            logger.info("Found %d live festivals from APIs", len(valid_festivals))
+            valid_festivals = valid_festivals[:50]  # Return top 50 festivals
+            self._cache = (time.monotonic(), valid_festivals)
+            return valid_festivals
             
         except Exception as e:
-            logger.error(f"Error collecting API data: {e}")
+            logger.error("Error collecting API data: %s", e)
             return []
     
-    def _get_ticketmaster_events(self) -> List[Dict[str, Any]]:
+    def _get_ticketmaster_events(self) -> List[FestivalEvent]:
         """Get events from Ticketmaster Discovery API"""
         if not self.ticketmaster_key:
             logger.warning("Ticketmaster API key not found")
@@ -89,19 +251,19 @@ class APIIntegrations:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 events = []
                 
                 if '_embedded' in data and 'events' in data['_embedded']:
                     for event in data['_embedded']['events']:
                         try:
                             # Extract venue information
-                            venue = event.get('_embedded', {}).get('venues', [{}])[0]
+                            venue = (_dig(event, '_embedded').get('venues') or [_EMPTY])[0]
+                            address_line = _dig(venue, 'address').get('line1', '')
                             
                             # Extract dates
-                            dates = event.get('dates', {})
-                            start_date = dates.get('start', {}).get('dateTime', '')
-                            end_date = dates.get('end', {}).get('dateTime', '')
+                            start_date = _dig(event, 'dates', 'start').get('dateTime', '')
+                            end_date = _dig(event, 'dates', 'end').get('dateTime', '')
                             
                             # Extract pricing
                             price_ranges = event.get('priceRanges', [])
@@ -112,30 +274,30 @@ class APIIntegrations:
                                 currency = price_ranges[0].get('currency', 'USD')
                                 price_info = f"${min_price}-{max_price} {currency}"
                             
-                            events.append({
-                                'name': event.get('name', 'Unknown Event'),
-                                'venue': venue.get('name', 'Unknown Venue'),
-                                'address': f"{venue.get('address', {}).get('line1', '')}, {venue.get('city', {}).get('name', 'Montreal')}, {venue.get('state', {}).get('stateCode', 'QC')}",
-                                'start_date': start_date,
-                                'end_date': end_date,
-                                'url': event.get('url', ''),
-                                'source': 'Ticketmaster',
-                                'category': self._categorize_event(event.get('name', '')),
-                                'price': price_info,
-                                'metro': self._get_nearest_metro(venue.get('address', {}).get('line1', ''))
-                            })
+                            events.append(FestivalEvent(
+                                name=event.get('name', 'Unknown Event'),
+                                venue=venue.get('name', 'Unknown Venue'),
+                                address=f"{address_line}, {_dig(venue, 'city').get('name', 'Montreal')}, {_dig(venue, 'state').get('stateCode', 'QC')}",
+                                start_date=start_date,
+                                end_date=end_date,
+                                url=event.get('url', ''),
+                                source='Ticketmaster',
+                                category=self._categorize_event(event.get('name', '')),
+                                price=price_info,
+                                metro=self._get_nearest_metro(address_line)
+                            ))
                             
                         except Exception as e:
-                            logger.error(f"Error parsing Ticketmaster event: {e}")
+                            logger.error("Error parsing Ticketmaster event: %s", e)
                 
                 return events
             
         except Exception as e:
-            logger.error(f"Error getting Ticketmaster events: {e}")
+            logger.error("Error getting Ticketmaster events: %s", e)
         
         return []
     
-    def _get_eventbrite_events(self) -> List[Dict[str, Any]]:
+    def _get_eventbrite_events(self) -> List[FestivalEvent]:
         """Get events from Eventbrite API"""
         if not self.eventbrite_token:
             logger.warning("Eventbrite token not found")
@@ -161,37 +323,39 @@ class APIIntegrations:
             response = self.session.get(url, headers=headers, params=params, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 events = []
                 
                 for event in data.get('events', []):
                     try:
-                        venue = event.get('venue', {})
+                        venue = _dig(event, 'venue')
+                        name = _dig(event, 'name').get('text', '')
+                        address = _dig(venue, 'address').get('localized_address_display', '')
                         
-                        events.append({
-                            'name': event.get('name', {}).get('text', 'Unknown Event'),
-                            'venue': venue.get('name', 'Unknown Venue'),
-                            'address': venue.get('address', {}).get('localized_address_display', 'Montreal'),
-                            'start_date': event.get('start', {}).get('utc', ''),
-                            'end_date': event.get('end', {}).get('utc', ''),
-                            'url': event.get('url', ''),
-                            'source': 'Eventbrite',
-                            'category': self._categorize_event(event.get('name', {}).get('text', '')),
-                            'price': self._get_eventbrite_price(event),
-                            'metro': self._get_nearest_metro(venue.get('address', {}).get('localized_address_display', ''))
-                        })
+                        events.append(FestivalEvent(
+                            name=name or 'Unknown Event',
+                            venue=venue.get('name', 'Unknown Venue'),
+                            address=address or 'Montreal',
+                            start_date=_dig(event, 'start').get('utc', ''),
+                            end_date=_dig(event, 'end').get('utc', ''),
+                            url=event.get('url', ''),
+                            source='Eventbrite',
+                            category=self._categorize_event(name),
+                            price=self._get_eventbrite_price(event),
+                            metro=self._get_nearest_metro(address)
+                        ))
                         
                     except Exception as e:
-                        logger.error(f"Error parsing Eventbrite event: {e}")
+                        logger.error("Error parsing Eventbrite event: %s", e)
                 
                 return events
             
         except Exception as e:
-            logger.error(f"Error getting Eventbrite events: {e}")
+            logger.error("Error getting Eventbrite events: %s", e)
         
         return []
     
-    def _get_meetup_events(self) -> List[Dict[str, Any]]:
+    def _get_meetup_events(self) -> List[FestivalEvent]:
         """Get events from Meetup API"""
         if not self.meetup_key:
             logger.warning("Meetup API key not found")
@@ -216,37 +380,44 @@ class APIIntegrations:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 events = []
                 
                 for event in data.get('results', []):
                     try:
-                        venue = event.get('venue', {})
+                        venue = _dig(event, 'venue')
+                        fee = _dig(event, 'fee').get('amount', 0)
                         
-                        events.append({
-                            'name': event.get('name', 'Unknown Event'),
-                            'venue': venue.get('name', 'Unknown Venue'),
-                            'address': venue.get('address_1', 'Montreal'),
-                            'start_date': datetime.fromtimestamp(event.get('time', 0) / 1000).isoformat(),
-                            'end_date': datetime.fromtimestamp((event.get('time', 0) + event.get('duration', 0)) / 1000).isoformat(),
-                            'url': event.get('event_url', ''),
-                            'source': 'Meetup',
-                            'category': self._categorize_event(event.get('name', '')),
-                            'price': 'Free' if event.get('fee', {}).get('amount', 0) == 0 else f"${event.get('fee', {}).get('amount', 0)}",
-                            'metro': self._get_nearest_metro(venue.get('address_1', ''))
-                        })
+                        # Meetup reports epoch milliseconds; convert explicitly as UTC
+                        start_ms = event.get('time', 0)
+                        end_ms = start_ms + event.get('duration', 0)
+                        start = datetime.fromtimestamp(start_ms // 1000, tz=timezone.utc)
+                        end = datetime.fromtimestamp(end_ms // 1000, tz=timezone.utc)
+                        
+                        events.append(FestivalEvent(
+                            name=event.get('name', 'Unknown Event'),
+                            venue=venue.get('name', 'Unknown Venue'),
+                            address=venue.get('address_1', 'Montreal'),
+                            start_date=start.isoformat(),
+                            end_date=end.isoformat(),
+                            url=event.get('event_url', ''),
+                            source='Meetup',
+                            category=self._categorize_event(event.get('name', '')),
+                            price='Free' if fee == 0 else f"${fee}",
+                            metro=self._get_nearest_metro(venue.get('address_1', ''))
+                        ))
                         
                     except Exception as e:
-                        logger.error(f"Error parsing Meetup event: {e}")
+                        logger.error("Error parsing Meetup event: %s", e)
                 
                 return events
             
         except Exception as e:
-            logger.error(f"Error getting Meetup events: {e}")
+            logger.error("Error getting Meetup events: %s", e)
         
         return []
     
-    def _get_facebook_events(self) -> List[Dict[str, Any]]:
+    def _get_facebook_events(self) -> List[FestivalEvent]:
         """Get events from Facebook Graph API"""
         if not self.facebook_token:
             logger.warning("Facebook access token not found")
@@ -267,29 +438,27 @@ class APIIntegrations:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
-                events = []
+                data = orjson.loads(response.content)
+                event_ids = [event.get('id', '') for event in data.get('data', [])]
+                event_ids = [event_id for event_id in event_ids if event_id]
                 
-                for event in data.get('data', []):
-                    try:
-                        # Get event details
-                        event_id = event.get('id', '')
-                        if event_id:
-                            event_details = self._get_facebook_event_details(event_id)
-                            if event_details:
-                                events.append(event_details)
-                        
-                    except Exception as e:
-                        logger.error(f"Error parsing Facebook event: {e}")
+                if not event_ids:
+                    return []
                 
-                return events
+                # Fetch event details concurrently; the worker cap bounds the
+                # number of in-flight Graph API requests
+                workers = min(FACEBOOK_DETAIL_WORKERS, len(event_ids))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    details = list(executor.map(self._get_facebook_event_details, event_ids))
+                
+                return [event_details for event_details in details if event_details]
             
         except Exception as e:
-            logger.error(f"Error getting Facebook events: {e}")
+            logger.error("Error getting Facebook events: %s", e)
         
         return []
     
-    def _get_facebook_event_details(self, event_id: str) -> Dict[str, Any]:
+    def _get_facebook_event_details(self, event_id: str) -> Optional[FestivalEvent]:
         """Get detailed information for a Facebook event"""
         try:
             url = f"https://graph.facebook.com/v18.0/{event_id}"
@@ -301,28 +470,29 @@ class APIIntegrations:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
-                event = response.json()
-                place = event.get('place', {})
+                event = orjson.loads(response.content)
+                place = _dig(event, 'place')
+                street = _dig(place, 'location').get('street', '')
                 
-                return {
-                    'name': event.get('name', 'Unknown Event'),
-                    'venue': place.get('name', 'Unknown Venue'),
-                    'address': place.get('location', {}).get('street', 'Montreal'),
-                    'start_date': event.get('start_time', ''),
-                    'end_date': event.get('end_time', ''),
-                    'url': event.get('ticket_uri', ''),
-                    'source': 'Facebook',
-                    'category': self._categorize_event(event.get('name', '')),
-                    'price': 'Free',
-                    'metro': self._get_nearest_metro(place.get('location', {}).get('street', ''))
-                }
+                return FestivalEvent(
+                    name=event.get('name', 'Unknown Event'),
+                    venue=place.get('name', 'Unknown Venue'),
+                    address=street or 'Montreal',
+                    start_date=event.get('start_time', ''),
+                    end_date=event.get('end_time', ''),
+                    url=event.get('ticket_uri', ''),
+                    source='Facebook',
+                    category=self._categorize_event(event.get('name', '')),
+                    price='Free',
+                    metro=self._get_nearest_metro(street)
+                )
             
         except Exception as e:
-            logger.error(f"Error getting Facebook event details: {e}")
+            logger.error("Error getting Facebook event details: %s", e)
         
-        return {}
+        return None
     
-    def _get_google_places_events(self) -> List[Dict[str, Any]]:
+    def _get_google_places_events(self) -> List[FestivalEvent]:
         """Get events from Google Places API"""
         if not self.google_places_key:
             logger.warning("Google Places API key not found")
@@ -342,36 +512,36 @@ class APIIntegrations:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 events = []
                 
                 for place in data.get('results', []):
                     try:
                         # Create a generic event for the venue
-                        events.append({
-                            'name': f"Events at {place.get('name', 'Unknown Venue')}",
-                            'venue': place.get('name', 'Unknown Venue'),
-                            'address': place.get('formatted_address', 'Montreal'),
-                            'start_date': datetime.now().isoformat(),
-                            'end_date': (datetime.now() + timedelta(days=30)).isoformat(),
-                            'url': place.get('website', ''),
-                            'source': 'Google Places',
-                            'category': 'other',
-                            'price': 'Varies',
-                            'metro': self._get_nearest_metro(place.get('formatted_address', ''))
-                        })
+                        events.append(FestivalEvent(
+                            name=f"Events at {place.get('name', 'Unknown Venue')}",
+                            venue=place.get('name', 'Unknown Venue'),
+                            address=place.get('formatted_address', 'Montreal'),
+                            start_date=datetime.now().isoformat(),
+                            end_date=(datetime.now() + timedelta(days=30)).isoformat(),
+                            url=place.get('website', ''),
+                            source='Google Places',
+                            category='other',
+                            price='Varies',
+                            metro=self._get_nearest_metro(place.get('formatted_address', ''))
+                        ))
                         
                     except Exception as e:
-                        logger.error(f"Error parsing Google Places venue: {e}")
+                        logger.error("Error parsing Google Places venue: %s", e)
                 
                 return events
             
         except Exception as e:
-            logger.error(f"Error getting Google Places events: {e}")
+            logger.error("Error getting Google Places events: %s", e)
         
         return []
     
-    def _get_quebec_open_data(self) -> List[Dict[str, Any]]:
+    def _get_quebec_open_data(self) -> List[FestivalEvent]:
         """Get events from Quebec Open Data"""
         try:
             # Quebec Open Data API for events
@@ -384,133 +554,109 @@ class APIIntegrations:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 events = []
                 
-                for record in data.get('result', {}).get('records', []):
+                for record in _dig(data, 'result').get('records', []):
                     try:
-                        events.append({
-                            'name': record.get('name', 'Unknown Event'),
-                            'venue': record.get('venue', 'Unknown Venue'),
-                            'address': record.get('address', 'Montreal'),
-                            'start_date': record.get('start_date', ''),
-                            'end_date': record.get('end_date', ''),
-                            'url': record.get('url', ''),
-                            'source': 'Quebec Open Data',
-                            'category': self._categorize_event(record.get('name', '')),
-                            'price': record.get('price', 'Free'),
-                            'metro': self._get_nearest_metro(record.get('address', ''))
-                        })
+                        events.append(FestivalEvent(
+                            name=record.get('name', 'Unknown Event'),
+                            venue=record.get('venue', 'Unknown Venue'),
+                            address=record.get('address', 'Montreal'),
+                            start_date=record.get('start_date', ''),
+                            end_date=record.get('end_date', ''),
+                            url=record.get('url', ''),
+                            source='Quebec Open Data',
+                            category=self._categorize_event(record.get('name', '')),
+                            price=record.get('price', 'Free'),
+                            metro=self._get_nearest_metro(record.get('address', ''))
+                        ))
                         
                     except Exception as e:
-                        logger.error(f"Error parsing Quebec Open Data event: {e}")
+                        logger.error("Error parsing Quebec Open Data event: %s", e)
                 
                 return events
             
         except Exception as e:
-            logger.error(f"Error getting Quebec Open Data events: {e}")
+            logger.error("Error getting Quebec Open Data events: %s", e)
         
         return []
     
     def _get_eventbrite_price(self, event: Dict[str, Any]) -> str:
         """Extract price information from Eventbrite event"""
         try:
-            ticket_classes = event.get('ticket_availability', {}).get('ticket_classes', [])
-            if ticket_classes:
-                prices = []
-                for ticket in ticket_classes:
-                    if ticket.get('free', False):
-                        prices.append('Free')
-                    else:
-                        cost = ticket.get('cost', {})
-                        if cost:
-                            currency = cost.get('currency', 'USD')
-                            amount = cost.get('major_value', 0)
-                            prices.append(f"{currency} {amount}")
+            # Collect straight into a set to drop duplicate price points
+            prices = set()
+            for ticket in _dig(event, 'ticket_availability').get('ticket_classes', []):
+                if ticket.get('free', False):
+                    prices.add('Free')
+                    continue
                 
-                if prices:
-                    return ', '.join(set(prices))  # Remove duplicates
+                cost = _dig(ticket, 'cost')
+                if cost:
+                    prices.add(f"{cost.get('currency', 'USD')} {cost.get('major_value', 0)}")
             
-            return 'Free'
+            # Sorted so the same event always renders the same string
+            return ', '.join(sorted(prices)) if prices else 'Free'
             
         except Exception as e:
-            logger.error(f"Error parsing Eventbrite price: {e}")
+            logger.error("Error parsing Eventbrite price: %s", e)
             return 'Free'
     
     def _get_nearest_metro(self, address: str) -> str:
         """Get nearest metro station based on address"""
-        # Simple metro station mapping
-        metro_stations = {
-            'quartier des spectacles': 'Place-des-Arts',
-            'place des arts': 'Place-des-Arts',
-            'old port': 'Place-d\'Armes',
-            'parc jean-drapeau': 'Jean-Drapeau',
-            'quartier latin': 'Berri-UQAM',
-            'downtown': 'McGill',
-            'plateau': 'Sherbrooke',
-            'mile end': 'Laurier'
-        }
-        
-        address_lower = address.lower()
-        for location, station in metro_stations.items():
-            if location in address_lower:
-                return station
-        
-        return 'Multiple stations'
+        # Many events share a venue, so lookups are cached per address
+        return _nearest_metro_cached(address.lower().strip())
     
     def _categorize_event(self, event_name: str) -> str:
         """Categorize event based on name"""
-        event_lower = event_name.lower()
+        for category, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(event_name):
+                return category
         
-        if any(word in event_lower for word in ['music', 'concert', 'jazz', 'rock', 'pop', 'band', 'singer', 'festival']):
-            return 'music'
-        elif any(word in event_lower for word in ['film', 'movie', 'cinema', 'documentary', 'screening', 'festival']):
-            return 'film'
-        elif any(word in event_lower for word in ['food', 'culinary', 'wine', 'beer', 'taste', 'dining', 'restaurant', 'festival']):
-            return 'food'
-        elif any(word in event_lower for word in ['art', 'exhibition', 'gallery', 'museum', 'painting', 'sculpture', 'festival']):
-            return 'art'
-        elif any(word in event_lower for word in ['comedy', 'standup', 'humor', 'laugh', 'joke', 'festival']):
-            return 'comedy'
-        elif any(word in event_lower for word in ['dance', 'ballet', 'performance', 'theatre', 'theater', 'festival']):
-            return 'dance'
-        else:
-            return 'other'
+        return 'other'
     
-    def _is_valid_festival(self, festival: Dict[str, Any], current_date: datetime) -> bool:
+    def _is_valid_festival(self, festival: FestivalEvent, current_date: datetime) -> bool:
         """Check if festival is valid and current"""
+        name = festival.name
+        start = festival.start_date
+        
+        # Check required fields and that the name is not too generic
+        if not (name and festival.venue and start) or len(name) < 3:
+            return False
+        
+        # Check if it's a current or upcoming event
         try:
-            # Check if it has required fields
-            required_fields = ['name', 'venue', 'start_date']
-            if not all(field in festival for field in required_fields):
-                return False
-            
-            # Check if name is not too generic
-            if len(festival['name']) < 3:
-                return False
-            
-            # Check if it's a current or upcoming event
-            try:
-                start_date = datetime.fromisoformat(festival['start_date'].replace('Z', '+00:00'))
-                # Accept events from 30 days ago to 90 days in the future
-                return (current_date - timedelta(days=30)) <= start_date <= (current_date + timedelta(days=90))
-            except:
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error validating festival: {e}")
+            start_date = datetime.fromisoformat(start.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
             return False
+        
+        # Naive timestamps are local time; make them comparable with current_date
+        if start_date.tzinfo is None:
+            start_date = start_date.astimezone()
+        
+        return current_date - _VALID_WINDOW_PAST <= start_date <= current_date + _VALID_WINDOW_FUTURE
 
-# Global API integrations instance
+# Global API integrations instance; it owns the process-wide pooled session
 _api_integrations = None
+_api_integrations_lock = threading.Lock()
 
 def get_api_integrations():
     """Get or create the global API integrations instance"""
     global _api_integrations
     if _api_integrations is None:
-        _api_integrations = APIIntegrations()
+        # Concurrent first callers must not each build their own session
+        with _api_integrations_lock:
+            if _api_integrations is None:
+                _api_integrations = APIIntegrations()
     return _api_integrations
 
+def invalidate_live_festivals() -> None:
+    """Make the next get_live_festivals_from_apis call bypass every cache"""
+    api_integrations = _api_integrations
+    if api_integrations is not None:
+        api_integrations.invalidate_cache()
+
 def get_live_festivals_from_apis():
     """Get live festival data from APIs"""
     api_integrations = get_api_integrations()
@@ -8,11 +8,19 @@ import sys
 from dotenv import load_dotenv
 from festival_service import get_ongoing_festivals
 from datetime import datetime
+from collections import defaultdict
+from functools import lru_cache
 import time
+import re
 
 # Load environment variables
 load_dotenv()
 
+@lru_cache(maxsize=1)
+def _cached_festivals():
+    """Collect festivals once and share them across the demos"""
+    return get_ongoing_festivals()
+
 def demo_real_time_data():
     """Demo the real-time festival data collection"""
     print("🎭 Montreal Festival Assistant - Real-Time Data Demo")
@@ -22,20 +30,24 @@ def demo_real_time_data():
     start_time = time.time()
     
     # Get festivals from all available sources
-    festivals = get_ongoing_festivals()
+    festivals = _cached_festivals()
     
     end_time = time.time()
     collection_time = end_time - start_time
     
-    print(f"⏱️  Data collection completed in {collection_time:.2f} seconds")
-    print(f"📊 Found {len(festivals)} festivals")
+    # Build the report and write it in one go instead of one print per line
+    lines = [
+        f"⏱️  Data collection completed in {collection_time:.2f} seconds",
+        f"📊 Found {len(festivals)} festivals"
+    ]
     
     if not festivals:
-        print("\n❌ No festivals found!")
-        print("This could be because:")
-        print("- No API keys are configured")
-        print("- APIs are not returning data")
-        print("- Network connectivity issues")
+        lines.append("\n❌ No festivals found!")
+        lines.append("This could be because:")
+        lines.append("- No API keys are configured")
+        lines.append("- APIs are not returning data")
+        lines.append("- Network connectivity issues")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
     
     # Display festivals by category
@@ -46,33 +58,36 @@ def demo_real_time_data():
             categories[cat] = []
         categories[cat].append(festival)
     
-    print(f"\n📋 Festivals by Category:")
+    lines.append("\n📋 Festivals by Category:")
     for category, events in categories.items():
-        print(f"\n🎭 {category.upper()} ({len(events)} events):")
+        lines.append(f"\n🎭 {category.upper()} ({len(events)} events):")
         for event in events:
-            print(f"   • {event['name']}")
-            print(f"     📍 {event['venue']}")
-            print(f"     💰 {event.get('price', 'N/A')}")
-            print(f"     📊 Source: {event['source']}")
+            lines.append(f"   • {event['name']}")
+            lines.append(f"     📍 {event['venue']}")
+            lines.append(f"     💰 {event.get('price', 'N/A')}")
+            lines.append(f"     📊 Source: {event['source']}")
     
     # Show sample detailed festival
-    if festivals:
-        print(f"\n🎪 Sample Festival Details:")
-        sample = festivals[0]
-        print(f"   Name: {sample['name']}")
-        print(f"   Venue: {sample['venue']}")
-        print(f"   Address: {sample['address']}")
-        print(f"   Dates: {sample['start_date']} to {sample['end_date']}")
-        print(f"   Category: {sample.get('category', 'N/A').upper()}")
-        print(f"   Price: {sample.get('price', 'N/A')}")
-        print(f"   Metro: {sample.get('metro', 'N/A')}")
-        print(f"   Info: {sample['url']}")
-        print(f"   Source: {sample['source']}")
+    sample = festivals[0]
+    lines.append("\n🎪 Sample Festival Details:")
+    lines.append(f"   Name: {sample['name']}")
+    lines.append(f"   Venue: {sample['venue']}")
+    lines.append(f"   Address: {sample['address']}")
+    lines.append(f"   Dates: {sample['start_date']} to {sample['end_date']}")
+    lines.append(f"   Category: {sample.get('category', 'N/A').upper()}")
+    lines.append(f"   Price: {sample.get('price', 'N/A')}")
+    lines.append(f"   Metro: {sample.get('metro', 'N/A')}")
+    lines.append(f"   Info: {sample['url']}")
+    lines.append(f"   Source: {sample['source']}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def demo_search_functionality():
     """Demo the search functionality"""
-    print("\n🔍 Demo Search Functionality")
-    print("=" * 40)
+    lines = [
+        "\n🔍 Demo Search Functionality",
+        "=" * 40
+    ]
     
     # Simulate user searches
     search_queries = [
@@ -83,61 +98,68 @@ def demo_search_functionality():
         "dance performances"
     ]
     
-    festivals = get_ongoing_festivals()
+    festivals = _cached_festivals()
+    
+    # Build an inverted index of name/category tokens once for all queries
+    index = defaultdict(set)
+    for i, festival in enumerate(festivals):
+        text = f"{festival['name']} {festival.get('category', '')}".lower()
+        for token in re.findall(r'\w+', text):
+            index[token].add(i)
     
     for query in search_queries:
-        print(f"\n🔎 Searching for: '{query}'")
+        lines.append(f"\n🔎 Searching for: '{query}'")
         
         # Simple search simulation
-        matching_festivals = []
-        query_lower = query.lower()
-        
-        for festival in festivals:
-            festival_name = festival['name'].lower()
-            festival_category = festival.get('category', '').lower()
-            
-            if (query_lower in festival_name or 
-                query_lower in festival_category or
-                any(word in festival_name for word in query_lower.split())):
-                matching_festivals.append(festival)
+        matched = set()
+        for word in query.lower().split():
+            matched |= index.get(word, set())
+        matching_festivals = [festivals[i] for i in sorted(matched)]
         
         if matching_festivals:
-            print(f"   ✅ Found {len(matching_festivals)} matching festivals:")
+            lines.append(f"   ✅ Found {len(matching_festivals)} matching festivals:")
             for festival in matching_festivals[:3]:  # Show top 3
-                print(f"      • {festival['name']} ({festival.get('category', 'N/A')})")
+                lines.append(f"      • {festival['name']} ({festival.get('category', 'N/A')})")
         else:
-            print(f"   ❌ No festivals found for '{query}'")
+            lines.append(f"   ❌ No festivals found for '{query}'")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def demo_api_status():
     """Show API status and recommendations"""
-    print("\n🔌 API Status & Recommendations")
-    print("=" * 40)
+    lines = [
+        "\n🔌 API Status & Recommendations",
+        "=" * 40
+    ]
     
-    api_keys = {
-        'Ticketmaster': os.getenv('TICKETMASTER_API_KEY'),
-        'Eventbrite': os.getenv('EVENTBRITE_TOKEN'),
-        'Meetup': os.getenv('MEETUP_API_KEY'),
-        'Facebook': os.getenv('FACEBOOK_ACCESS_TOKEN'),
-        'Google Places': os.getenv('GOOGLE_PLACES_API_KEY')
-    }
+    env = os.environ
+    api_keys = {name: env.get(var) for name, var in [
+        ('Ticketmaster', 'TICKETMASTER_API_KEY'),
+        ('Eventbrite', 'EVENTBRITE_TOKEN'),
+        ('Meetup', 'MEETUP_API_KEY'),
+        ('Facebook', 'FACEBOOK_ACCESS_TOKEN'),
+        ('Google Places', 'GOOGLE_PLACES_API_KEY')
+    ]}
     
     configured_apis = [name for name, key in api_keys.items() if key]
     
     if configured_apis:
-        print("✅ Configured APIs:")
+        lines.append("✅ Configured APIs:")
         for api in configured_apis:
-            print(f"   • {api}")
+            lines.append(f"   • {api}")
     else:
-        print("❌ No external APIs configured")
-        print("   The system is using fallback data")
-    
-    print(f"\n💡 To get real-time data, configure these APIs:")
-    print("   • Ticketmaster Discovery API")
-    print("   • Eventbrite API")
-    print("   • Meetup API")
-    print("   • Facebook Graph API")
-    print("   • Google Places API")
-    print("\n📖 See api_setup_guide.md for detailed setup instructions")
+        lines.append("❌ No external APIs configured")
+        lines.append("   The system is using fallback data")
+    
+    lines.append("\n💡 To get real-time data, configure these APIs:")
+    lines.append("   • Ticketmaster Discovery API")
+    lines.append("   • Eventbrite API")
+    lines.append("   • Meetup API")
+    lines.append("   • Facebook Graph API")
+    lines.append("   • Google Places API")
+    lines.append("\n📖 See api_setup_guide.md for detailed setup instructions")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Run the demo"""
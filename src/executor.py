@@ -1,18 +1,286 @@
+import asyncio
+import json
 import logging
 import os
-from typing import Dict, Any
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple, TypedDict
 from dotenv import load_dotenv
 import google.generativeai as genai
 from festival_service import get_ongoing_festivals
 
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+MODEL_NAME = 'models/gemini-1.5-pro'
+
+DATA_SOURCES = 'Real-time APIs (Ticketmaster, Eventbrite, Meetup, Facebook, Google Places)'
+
+# (festivals, formatted) for the festival list last formatted; the festival
+# service returns the same list object until its cache refreshes
+_formatted_festivals = (None, '')
+
+# Static instructions, kept as a contiguous prompt prefix so the model
+# provider can reuse it across requests; per-request data is appended after
+SYSTEM_PREFIX = """You are a Montreal Festival Assistant. Provide EXACT, CONCISE information for festival requests.
+
+REQUIREMENTS:
+1. Use ONLY the real festival data provided below
+2. Provide EXACT venue addresses for Google Maps
+3. Give specific cost estimations in CAD
+4. Include metro station information
+5. Keep responses under 5 points, each under 20 words
+6. Format: [Festival name], [Venue], [Google Maps address], [Cost in CAD], [Metro station]
+
+If no matching festivals found, suggest alternatives or explain why.
+"""
+
+# Full prompt: the static prefix followed by the per-request sections
+_PROMPT_TEMPLATE = SYSTEM_PREFIX + """
+AVAILABLE REAL-TIME FESTIVAL DATA:
+{festival_data}
+
+USER REQUEST: {task}
+
+CONTEXT: {ctx}
+"""
+
+# Per-festival block of the prompt's festival data section
+_FESTIVAL_TEMPLATE = """
+Festival: {name}
+Venue: {venue}
+Address: {address}
+Category: {category}
+Price: {price}
+Metro: {metro}
+Dates: {start_date} to {end_date}
+Source: {source}
+"""
+
+class FestivalAnswer(TypedDict):
+    """One festival entry of a structured task response"""
+    name: str
+    venue: str
+    address: str
+    cost_cad: str
+    metro: str
+
+# Worker threads for callers that run tasks in the background (submit_task)
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='execute-task')
+
+# Semantic cache of recent task results. Every task reuses the result of an
+# exact repeat (for the same festival data and context); helper tasks about a
+# named festival also match a differently written name for the same task type,
+# by comparing embeddings of the name alone. Free-form tasks and search queries
+# are only matched exactly, since "music" vs "comedy festivals this weekend"
+# embed close together but want different answers.
+EMBEDDING_MODEL = 'models/text-embedding-004'
+SEMANTIC_CACHE_SIZE = 128
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX_CHARS = 200
+
+# Context field holding the free text compared semantically
+_SEMANTIC_TEXT_FIELD = 'festival_name'
+
+# [festivals, context_key, task_key, semantic_key, embedding, result] entries,
+# newest last; the embedding is filled in by a background job after the entry
+# is stored
+_semantic_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)
+_semantic_cache_lock = threading.Lock()
+
+# Tasks answered straight from the festival data, without a model call
+_LIST_FESTIVALS_PATTERN = re.compile(
+    r'^(?:list|show)(?: me)?(?: all)?(?: the)?(?: current| ongoing| upcoming)? festivals\W*$',
+    re.IGNORECASE
+)
+_LOCATION_TASK_PATTERN = re.compile(r'\b(?:location|directions?|where|address)\b', re.IGNORECASE)
+
+# Sections returned by get_festival_bundle
+_BUNDLE_KEYS = ('location', 'directions', 'cost')
+
+class _Defaulting(dict):
+    """Festival fields for the prompt template, with 'N/A' for missing ones"""
+    def __missing__(self, key):
+        return 'N/A'
+
+@lru_cache(maxsize=1)
+def _init_genai() -> None:
+    """Configure the Gemini API once per process"""
+    # Only read .env when the key isn't already in the environment
+    if not os.environ.get('GOOGLE_API_KEY'):
+        load_dotenv()
+    genai.configure(api_key=os.environ.get('GOOGLE_API_KEY'))
+
+@lru_cache(maxsize=1)
+def _get_model() -> genai.GenerativeModel:
+    """Get the shared Gemini model instance, created on first use"""
+    _init_genai()
+    return genai.GenerativeModel(MODEL_NAME)
+
+def _build_prompt(task_description: str, festivals: list, context: Dict[str, Any] = None) -> tuple:
+    """Build the Gemini prompt and the festival context for a task"""
+    # Create context with real data; the festivals themselves are already in
+    # the prompt's festival data block, so they are not repeated here
+    festival_context = {
+        'location': 'Montreal, Canada',
+        'festival_focus': True,
+        'total_festivals': len(festivals),
+        'data_sources': DATA_SOURCES
+    }
+    
+    if context:
+        festival_context.update(context)
+    
+    # Create enhanced prompt: static prefix first, request-specific data last
+    enhanced_prompt = _PROMPT_TEMPLATE.format(
+        festival_data=_format_festival_data_cached(festivals),
+        task=task_description,
+        ctx=festival_context
+    )
+    
+    return enhanced_prompt, festival_context
+
+def _success_result(response_text: str, festivals: list, festival_context: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the result dict for a successful task"""
+    logger.info("Task executed successfully with %d real festivals", len(festivals))
+    return {
+        'status': 'success',
+        'response': response_text,
+        'model_used': MODEL_NAME,
+        'real_time_data_used': True,
+        'festivals_available': len(festivals),
+        'data_sources': festival_context['data_sources']
+    }
+
+def _error_result(error: Exception) -> Dict[str, Any]:
+    """Build the result dict for a failed task"""
+    logger.error("Error executing task: %s", error)
+    return {
+        'status': 'error',
+        'error': str(error),
+        'response': f"I apologize, but I encountered an error: {str(error)}"
+    }
+
+def _maybe_direct_answer(task_description: str, festivals: list) -> Optional[Dict[str, Any]]:
+    """Answer trivial tasks straight from the festival data, without a model call"""
+    task = task_description.strip()
+    
+    if not task:
+        response = "Please tell me what you'd like to know about Montreal festivals."
+    elif _LIST_FESTIVALS_PATTERN.match(task):
+        if festivals:
+            response = "\n".join(
+                f"{festival['name']}, {festival['venue']}, {festival['address']}, "
+                f"{festival.get('price', 'N/A')}, {festival.get('metro', 'N/A')}"
+                for festival in festivals
+            )
+        else:
+            response = "No festivals currently available."
+    elif not festivals and _LOCATION_TASK_PATTERN.search(task):
+        response = "No festival data is currently available, so I can't look up locations right now."
+    else:
+        return None
+    
+    logger.info("Answered task directly without a model call")
+    return {
+        'status': 'success',
+        'response': response,
+        'model_used': None,
+        'real_time_data_used': True,
+        'festivals_available': len(festivals),
+        'data_sources': DATA_SOURCES
+    }
+
+def _embed_task(text: str) -> Optional[List[float]]:
+    """Embed short text for semantic cache lookups, or None if not applicable"""
+    if len(text) > SEMANTIC_CACHE_MAX_CHARS:
+        return None
+    
+    try:
+        _init_genai()
+        return genai.embed_content(model=EMBEDDING_MODEL, content=text)['embedding']
+    except Exception as e:
+        logger.warning("Could not embed task for the semantic cache: %s", e)
+        return None
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(y * y for y in b) ** 0.5
+    return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+
+def _semantic_cache_keys(task_description: str, context: Optional[Dict[str, Any]]
+                         ) -> Tuple[str, str, Optional[Tuple[str, str]], Optional[str]]:
+    """
+    Cache keys for a task
+    
+    Returns the exact context and task keys, plus the semantic key and the free
+    text to embed; both of the latter are None when the task is only matched
+    exactly.
+    """
+    context_key = repr(sorted(context.items())) if context else ''
+    task_key = task_description.strip().lower()
+    
+    text = context.get(_SEMANTIC_TEXT_FIELD) if context else None
+    if not context or not context.get('task_type') or not isinstance(text, str):
+        return context_key, task_key, None, None
+    
+    # Same task type and remaining context; only the festival name may differ
+    rest = sorted((k, v) for k, v in context.items() if k != _SEMANTIC_TEXT_FIELD)
+    return context_key, task_key, (str(context['task_type']).lower(), repr(rest)), text.strip()
+
+def _semantic_cache_lookup(task_description: str, context: Optional[Dict[str, Any]],
+                           festivals: list) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+    """Find a cached result for an equivalent task; also returns the embedding of its free text"""
+    context_key, task_key, semantic_key, text = _semantic_cache_keys(task_description, context)
+    
+    with _semantic_cache_lock:
+        entries = [entry for entry in _semantic_cache if entry[0] is festivals]
+    
+    # Exact repeats need no embedding at all
+    for _, cached_context, cached_task, _, _, result in reversed(entries):
+        if cached_context == context_key and cached_task == task_key:
+            return dict(result, cached=True), None
+    
+    if semantic_key is None:
+        return None, None
+    
+    # An embedding costs a request of its own; only pay for it when there is
+    # an embedded entry of the same task type to compare against
+    entries = [entry for entry in entries if entry[3] == semantic_key and entry[4] is not None]
+    if not entries:
+        return None, None
+    
+    embedding = _embed_task(text)
+    if embedding is not None:
+        for _, _, _, _, cached_embedding, result in reversed(entries):
+            if _cosine_similarity(embedding, cached_embedding) >= SEMANTIC_CACHE_THRESHOLD:
+                return dict(result, cached=True), embedding
+    
+    return None, embedding
+
+def _semantic_cache_store(task_description: str, context: Optional[Dict[str, Any]], festivals: list,
+                          embedding: Optional[List[float]], result: Dict[str, Any]) -> None:
+    """Remember a successful task result"""
+    context_key, task_key, semantic_key, text = _semantic_cache_keys(task_description, context)
+    # Callers add keys to the result they get back; keep our own copy
+    entry = [festivals, context_key, task_key, semantic_key,
+             embedding if semantic_key is not None else None, dict(result)]
+    with _semantic_cache_lock:
+        _semantic_cache.append(entry)
+    
+    # Embed off the request path; until then only exact repeats match
+    if semantic_key is not None and entry[4] is None:
+        _EXECUTOR.submit(_embed_cache_entry, entry, text)
+
+def _embed_cache_entry(entry: list, text: str) -> None:
+    """Fill in the embedding of a stored semantic cache entry"""
+    entry[4] = _embed_task(text)
 
 def execute_task(task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
     """
@@ -26,88 +294,182 @@ def execute_task(task_description: str, context: Dict[str, Any] = None) -> Dict[
         Dict[str, Any]: Task execution results
     """
     try:
-        logger.info(f"Executing task: {task_description}")
+        logger.info("Executing task: %s", task_description)
         
         # Get real festival data from APIs
         festivals = get_ongoing_festivals()
         
-        # Create context with real data
-        festival_context = {
-            'location': 'Montreal, Canada',
-            'festival_focus': True,
-            'available_festivals': festivals,
-            'total_festivals': len(festivals),
-            'data_sources': 'Real-time APIs (Ticketmaster, Eventbrite, Meetup, Facebook, Google Places)'
-        }
+        direct = _maybe_direct_answer(task_description, festivals)
+        if direct:
+            return direct
+        
+        cached, embedding = _semantic_cache_lookup(task_description, context, festivals)
+        if cached:
+            logger.info("Serving task from the semantic cache")
+            return cached
+        
+        enhanced_prompt, festival_context = _build_prompt(task_description, festivals, context)
+        
+        # Use Gemini API
+        response = _get_model().generate_content(enhanced_prompt)
+        
+        result = _success_result(response.text, festivals, festival_context)
+        _semantic_cache_store(task_description, context, festivals, embedding, result)
+        return result
+        
+    except Exception as e:
+        return _error_result(e)
+
+def execute_prompt(prompt: str) -> Dict[str, Any]:
+    """
+    Send a complete prompt to Gemini as-is
+    
+    Unlike execute_task, no system prefix or festival data is added and the
+    semantic cache is skipped; for callers whose prompt sets its own format.
+    
+    Args:
+        prompt (str): The full prompt
         
-        if context:
-            festival_context.update(context)
+    Returns:
+        Dict[str, Any]: 'status' and 'response', as from execute_task
+    """
+    try:
+        response = _get_model().generate_content(prompt)
+        return {'status': 'success', 'response': response.text, 'model_used': MODEL_NAME}
+    except Exception as e:
+        return _error_result(e)
+
+def warmup() -> None:
+    """
+    Pay the Gemini cold-start costs (setup, model handle) ahead of the first
+    request; meant to run in a background thread at startup. The festival
+    cache is filled by the assistant's own prefetch.
+    """
+    try:
+        _init_genai()
+        _get_model()
+        logger.info("Executor warmed up")
+    except Exception as e:
+        logger.warning("Executor warmup failed: %s", e)
+
+def submit_task(task_description: str, context: Dict[str, Any] = None) -> Future:
+    """
+    Run execute_task on the shared worker pool
+    
+    Lets synchronous servers overlap several Gemini round-trips; async
+    callers can use loop.run_in_executor with the same pool instead.
+    
+    Args:
+        task_description (str): Description of the task to execute
+        context (Dict[str, Any]): Additional context for the task
         
-        # Create enhanced prompt with real data
-        enhanced_prompt = f"""
-        You are a Montreal Festival Assistant. Provide EXACT, CONCISE information for festival requests.
+    Returns:
+        Future: Resolves to the execute_task result dict
+    """
+    return _EXECUTOR.submit(execute_task, task_description, context)
+
+async def execute_task_async(task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Async variant of execute_task, so several tasks can be awaited together
+    (e.g. with asyncio.gather) instead of paying one round-trip after another
+    
+    Args:
+        task_description (str): Description of the task to execute
+        context (Dict[str, Any]): Additional context for the task
         
-        AVAILABLE REAL-TIME FESTIVAL DATA:
-        {_format_festival_data(festivals)}
+    Returns:
+        Dict[str, Any]: Task execution results
+    """
+    try:
+        logger.info("Executing task: %s", task_description)
         
-        USER REQUEST: {task_description}
+        # Festival collection is blocking I/O on a cache miss; keep it off the loop
+        loop = asyncio.get_running_loop()
+        festivals = await loop.run_in_executor(None, get_ongoing_festivals)
         
-        CONTEXT: {festival_context}
+        direct = _maybe_direct_answer(task_description, festivals)
+        if direct:
+            return direct
         
-        REQUIREMENTS:
-        1. Use ONLY the real festival data provided above
-        2. Provide EXACT venue addresses for Google Maps
-        3. Give specific cost estimations in CAD
-        4. Include metro station information
-        5. Keep responses under 5 points, each under 20 words
-        6. Format: [Festival name], [Venue], [Google Maps address], [Cost in CAD], [Metro station]
+        # The lookup may embed the task, which is a blocking call
+        cached, embedding = await loop.run_in_executor(
+            None, _semantic_cache_lookup, task_description, context, festivals
+        )
+        if cached:
+            logger.info("Serving task from the semantic cache")
+            return cached
         
-        If no matching festivals found, suggest alternatives or explain why.
-        """
+        enhanced_prompt, festival_context = _build_prompt(task_description, festivals, context)
         
         # Use Gemini API
-        model = genai.GenerativeModel('models/gemini-1.5-pro')
-        response = model.generate_content(enhanced_prompt)
-        
-        result = {
-            'status': 'success',
-            'response': response.text,
-            'model_used': 'models/gemini-1.5-pro',
-            'real_time_data_used': True,
-            'festivals_available': len(festivals),
-            'data_sources': festival_context['data_sources']
-        }
+        response = await _get_model().generate_content_async(enhanced_prompt)
         
-        logger.info(f"Task executed successfully with {len(festivals)} real festivals")
+        result = _success_result(response.text, festivals, festival_context)
+        _semantic_cache_store(task_description, context, festivals, embedding, result)
         return result
         
     except Exception as e:
-        logger.error(f"Error executing task: {e}")
-        return {
-            'status': 'error',
-            'error': str(e),
-            'response': f"I apologize, but I encountered an error: {str(e)}"
-        }
+        return _error_result(e)
+
+def execute_task_stream(task_description: str, context: Dict[str, Any] = None) -> Iterator[str]:
+    """
+    Execute a task like execute_task, yielding response text as it is generated
+    
+    Args:
+        task_description (str): Description of the task to execute
+        context (Dict[str, Any]): Additional context for the task
+        
+    Yields:
+        str: Chunks of the response text
+    """
+    try:
+        logger.info("Executing streamed task: %s", task_description)
+        
+        festivals = get_ongoing_festivals()
+        
+        direct = _maybe_direct_answer(task_description, festivals)
+        if direct:
+            yield direct['response']
+            return
+        
+        cached, embedding = _semantic_cache_lookup(task_description, context, festivals)
+        if cached:
+            logger.info("Serving task from the semantic cache")
+            yield cached['response']
+            return
+        
+        enhanced_prompt, festival_context = _build_prompt(task_description, festivals, context)
+        
+        chunks = []
+        for chunk in _get_model().generate_content(enhanced_prompt, stream=True):
+            chunks.append(chunk.text)
+            yield chunk.text
+        
+        # Cache only complete responses
+        result = _success_result(''.join(chunks), festivals, festival_context)
+        _semantic_cache_store(task_description, context, festivals, embedding, result)
+        
+    except Exception as e:
+        yield _error_result(e)['response']
+
+def _format_festival_data_cached(festivals: list) -> str:
+    """Format festival data, reusing the result while the festival list is unchanged"""
+    global _formatted_festivals
+    
+    cached_festivals, formatted = _formatted_festivals
+    if cached_festivals is festivals:
+        return formatted
+    
+    formatted = _format_festival_data(festivals)
+    _formatted_festivals = (festivals, formatted)
+    return formatted
 
 def _format_festival_data(festivals: list) -> str:
     """Format festival data for the prompt"""
     if not festivals:
         return "No festivals currently available."
     
-    formatted_data = []
-    for festival in festivals:
-        formatted_data.append(f"""
-        Festival: {festival['name']}
-        Venue: {festival['venue']}
-        Address: {festival['address']}
-        Category: {festival.get('category', 'N/A')}
-        Price: {festival.get('price', 'N/A')}
-        Metro: {festival.get('metro', 'N/A')}
-        Dates: {festival['start_date']} to {festival['end_date']}
-        Source: {festival['source']}
-        """)
-    
-    return "\n".join(formatted_data)
+    return "\n".join(_FESTIVAL_TEMPLATE.format_map(_Defaulting(festival)) for festival in festivals)
 
 def search_festival_information(query: str) -> Dict[str, Any]:
     """Search for festival information using real-time data"""
@@ -136,3 +498,112 @@ def estimate_festival_cost(festival_name: str) -> Dict[str, Any]:
         'task_type': 'cost_estimation',
         'festival_name': festival_name
     })
+
+
+async def search_festival_information_async(query: str) -> Dict[str, Any]:
+    """Async variant of search_festival_information"""
+    return await execute_task_async(f"Search for festivals matching: {query}", {
+        'task_type': 'search',
+        'query': query
+    })
+
+async def get_festival_location_async(festival_name: str) -> Dict[str, Any]:
+    """Async variant of get_festival_location"""
+    return await execute_task_async(f"Get location and details for: {festival_name}", {
+        'task_type': 'location',
+        'festival_name': festival_name
+    })
+
+async def get_festival_directions_async(festival_name: str) -> Dict[str, Any]:
+    """Async variant of get_festival_directions"""
+    return await execute_task_async(f"Get directions to: {festival_name}", {
+        'task_type': 'directions',
+        'festival_name': festival_name
+    })
+
+async def estimate_festival_cost_async(festival_name: str) -> Dict[str, Any]:
+    """Async variant of estimate_festival_cost"""
+    return await execute_task_async(f"Estimate total cost for: {festival_name}", {
+        'task_type': 'cost_estimation',
+        'festival_name': festival_name
+    })
+
+def get_festival_bundle(festival_name: str) -> Dict[str, Any]:
+    """
+    Get location, directions and cost for a festival in a single Gemini request
+    
+    Args:
+        festival_name (str): Name of the festival
+        
+    Returns:
+        Dict[str, Any]: Task execution results with 'location', 'directions'
+        and 'cost' entries on success
+    """
+    result = execute_task(
+        f"Get location, directions and total cost estimate for: {festival_name}. "
+        f"Respond with only a JSON object with the string keys {', '.join(_BUNDLE_KEYS)}.",
+        {
+            'task_type': 'bundle',
+            'festival_name': festival_name
+        }
+    )
+    
+    if result['status'] != 'success':
+        return result
+    
+    try:
+        bundle = _parse_json_response(result['response'])
+        if not isinstance(bundle, dict):
+            raise ValueError("expected a JSON object")
+    except ValueError as e:
+        logger.warning("Could not parse festival bundle response: %s", e)
+        bundle = {}
+    
+    # Fall back to the full text for any part the model did not return
+    for key in _BUNDLE_KEYS:
+        result[key] = bundle.get(key) or result['response']
+    
+    return result
+
+def execute_task_structured(task_description: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Execute a task and return the matching festivals as structured records
+    
+    Args:
+        task_description (str): Description of the task to execute
+        context (Dict[str, Any]): Additional context for the task
+        
+    Returns:
+        Dict[str, Any]: Task execution results; on success 'answers' holds a
+        list of FestivalAnswer dicts
+    """
+    keys = list(FestivalAnswer.__annotations__)
+    result = execute_task(
+        f"{task_description}\n"
+        f"Respond with only a JSON array of objects with the string keys {', '.join(keys)}.",
+        context
+    )
+    
+    if result['status'] != 'success':
+        return result
+    
+    try:
+        answers = _parse_json_response(result['response'])
+        if not isinstance(answers, list) or not all(isinstance(a, dict) for a in answers):
+            raise ValueError("expected a JSON array of objects")
+    except ValueError as e:
+        # Fail fast on malformed output rather than handing back free text
+        return _error_result(e)
+    
+    result['answers'] = [{key: str(answer.get(key, '')) for key in keys} for answer in answers]
+    return result
+
+def _parse_json_response(text: str) -> Any:
+    """Parse JSON from a model response, tolerating code fences"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.strip('`')
+        if text.startswith('json'):
+            text = text[len('json'):]
+    
+    return json.loads(text)
@@ -1,478 +1,481 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import orjson
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
 import os
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import time
+import calendar
+from functools import lru_cache
 import re
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Scraped listings change over hours, not seconds
+SCRAPE_CACHE_TTL = 900
+
+# Listing pages are a few hundred KB; anything far beyond that is not worth parsing
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# CSS class patterns used to locate event markup, compiled once
+_EVENT_CLASS_RE = re.compile(r'event|festival|activity')
+_ARTICLE_CLASS_RE = re.compile(r'event|story|article')
+_LOCAL_EVENT_CLASS_RE = re.compile(r'event|festival|concert|activity')
+_DATE_CLASS_RE = re.compile(r'date|time|when')
+_LOCATION_CLASS_RE = re.compile(r'location|venue|where')
+
+# Tags searched when extracting an event's fields
+_EVENT_TAGS = ['div', 'article']
+_TITLE_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5']
+_DATE_TAGS = ['time', 'span', 'div']
+_LOCATION_TAGS = ['span', 'div']
+
+# Only build the tree for candidate event elements, skipping scripts,
+# navigation and the rest of the page chrome
+_EVENT_STRAINER = SoupStrainer(_EVENT_TAGS, class_=_EVENT_CLASS_RE)
+_ARTICLE_STRAINER = SoupStrainer(_EVENT_TAGS, class_=_ARTICLE_CLASS_RE)
+_LOCAL_EVENT_STRAINER = SoupStrainer(_EVENT_TAGS, class_=_LOCAL_EVENT_CLASS_RE)
+
+# Date shapes accepted by _parse_date, in the order they are tried
+_DATE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$',      # %Y-%m-%d
+    r'(?P<month>[A-Za-z]+) (?P<day>\d{1,2}), (?P<year>\d{4})$',   # %B %d, %Y
+    r'(?P<day>\d{1,2}) (?P<month>[A-Za-z]+) (?P<year>\d{4})$',    # %d %B %Y
+    r'(?P<year>\d{4})/(?P<month>\d{1,2})/(?P<day>\d{1,2})$',      # %Y/%m/%d
+    r'(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})$',      # %m/%d/%Y
+    r'(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})$',      # %d/%m/%Y
+))
+_MONTHS = {name.lower(): index for index, name in enumerate(calendar.month_name) if name}
+
+# Keyword tables matched against whole words of an event name
+_CULTURAL_KEYWORDS = frozenset({
+    'festival', 'concert', 'music', 'jazz', 'rock', 'pop', 'classical',
+    'art', 'exhibition', 'gallery', 'museum', 'theatre', 'theater',
+    'dance', 'ballet', 'comedy', 'film', 'movie', 'cinema',
+    'food', 'culinary', 'wine', 'beer', 'taste', 'tasting', 'culture',
+    'performance', 'show', 'entertainment', 'celebration'
+})
+_BUSINESS_KEYWORDS = frozenset({
+    'conference', 'summit', 'expo', 'trade', 'business', 'technology',
+    'cyber', 'security', 'ai', 'startup',
+    'networking', 'workshop', 'seminar', 'meeting', 'forum'
+})
+_CATEGORY_KEYWORDS = (
+    ('music', frozenset({'music', 'concert', 'jazz', 'rock', 'pop', 'band', 'singer'})),
+    ('film', frozenset({'film', 'movie', 'cinema', 'documentary', 'screening'})),
+    ('food', frozenset({'food', 'culinary', 'wine', 'beer', 'taste', 'tasting', 'dining', 'restaurant'})),
+    ('art', frozenset({'art', 'exhibition', 'gallery', 'museum', 'painting', 'sculpture'})),
+    ('comedy', frozenset({'comedy', 'standup', 'humor', 'laugh', 'joke'})),
+    ('dance', frozenset({'dance', 'ballet', 'performance', 'theatre', 'theater'}))
+)
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+
+@lru_cache(maxsize=1024)
+def _keyword_tokens(text: str) -> frozenset:
+    """Lowercased words of text, with plurals also reduced to singular"""
+    words = _WORD_RE.findall(text.lower())
+    return frozenset(words).union(word[:-1] for word in words if word.endswith('s'))
+
+
+# Known Montreal festivals with their actual websites; dates are
+# (month, day, hour, minute) and get a year when the list is built
+_KNOWN_FESTIVALS = (
+    {
+        'name': 'Montreal Jazz Festival',
+        'venue': 'Quartier des Spectacles',
+        'address': 'Quartier des Spectacles, Montreal, QC H2X 1X8',
+        'start_date': (6, 27, 18, 0),
+        'end_date': (7, 6, 23, 0),
+        'url': 'https://www.montrealjazzfest.com',
+        'source': 'Official Festival Site',
+        'category': 'music',
+        'price': '$25-150 CAD',
+        'metro': 'Place-des-Arts'
+    },
+    {
+        'name': 'Osheaga Music Festival',
+        'venue': 'Parc Jean-Drapeau',
+        'address': 'Parc Jean-Drapeau, Montreal, QC H3C 6A3',
+        'start_date': (8, 2, 12, 0),
+        'end_date': (8, 4, 23, 0),
+        'url': 'https://www.osheaga.com',
+        'source': 'Official Festival Site',
+        'category': 'music',
+        'price': '$150-300 CAD',
+        'metro': 'Jean-Drapeau'
+    },
+    {
+        'name': 'Just for Laughs Comedy Festival',
+        'venue': 'Quartier Latin',
+        'address': 'Quartier Latin, Montreal, QC H2L 2L4',
+        'start_date': (7, 10, 19, 0),
+        'end_date': (7, 28, 23, 0),
+        'url': 'https://www.hahaha.com',
+        'source': 'Official Festival Site',
+        'category': 'comedy',
+        'price': '$30-120 CAD',
+        'metro': 'Berri-UQAM'
+    },
+    {
+        'name': 'Montreal International Film Festival',
+        'venue': 'Various Cinemas',
+        'address': 'Downtown Montreal, QC',
+        'start_date': (8, 22, 10, 0),
+        'end_date': (9, 2, 23, 0),
+        'url': 'https://www.ffm-montreal.org',
+        'source': 'Official Festival Site',
+        'category': 'film',
+        'price': '$15-50 CAD',
+        'metro': 'Place-des-Arts'
+    },
+    {
+        'name': 'Montreal Food Festival',
+        'venue': 'Old Port of Montreal',
+        'address': 'Old Port of Montreal, QC H2Y 1C6',
+        'start_date': (7, 15, 11, 0),
+        'end_date': (7, 21, 22, 0),
+        'url': 'https://www.montrealfoodfest.com',
+        'source': 'Official Festival Site',
+        'category': 'food',
+        'price': '$20-80 CAD',
+        'metro': 'Place-d\'Armes'
+    },
+    {
+        'name': 'Montreal Art Festival',
+        'venue': 'Place des Arts',
+        'address': 'Place des Arts, Montreal, QC H2X 1Y9',
+        'start_date': (9, 10, 10, 0),
+        'end_date': (9, 15, 18, 0),
+        'url': 'https://www.montrealartfest.com',
+        'source': 'Official Festival Site',
+        'category': 'art',
+        'price': '$15-50 CAD',
+        'metro': 'Place-des-Arts'
+    },
+    {
+        'name': 'Montreal Beer Festival',
+        'venue': 'Palais des Congrès',
+        'address': 'Palais des Congrès, Montreal, QC H2Z 1H2',
+        'start_date': (8, 8, 12, 0),
+        'end_date': (8, 10, 22, 0),
+        'url': 'https://www.montrealbeerfest.com',
+        'source': 'Official Festival Site',
+        'category': 'food',
+        'price': '$40-100 CAD',
+        'metro': 'Place-d\'Armes'
+    },
+    {
+        'name': 'Montreal Electronic Music Festival',
+        'venue': 'Parc Jean-Drapeau',
+        'address': 'Parc Jean-Drapeau, Montreal, QC H3C 6A3',
+        'start_date': (7, 20, 14, 0),
+        'end_date': (7, 21, 23, 0),
+        'url': 'https://www.montrealelectronicfest.com',
+        'source': 'Official Festival Site',
+        'category': 'music',
+        'price': '$80-200 CAD',
+        'metro': 'Jean-Drapeau'
+    },
+    {
+        'name': 'Montreal Street Art Festival',
+        'venue': 'Various Locations',
+        'address': 'Downtown Montreal, QC',
+        'start_date': (7, 25, 10, 0),
+        'end_date': (7, 27, 18, 0),
+        'url': 'https://www.montrealstreetart.com',
+        'source': 'Official Festival Site',
+        'category': 'art',
+        'price': 'Free',
+        'metro': 'Multiple stations'
+    },
+    {
+        'name': 'Montreal Wine Festival',
+        'venue': 'Old Port of Montreal',
+        'address': 'Old Port of Montreal, QC H2Y 1C6',
+        'start_date': (8, 30, 11, 0),
+        'end_date': (9, 1, 22, 0),
+        'url': 'https://www.montrealwinefest.com',
+        'source': 'Official Festival Site',
+        'category': 'food',
+        'price': '$60-150 CAD',
+        'metro': 'Place-d\'Armes'
+    },
+    {
+        'name': 'Montreal Summer Festival',
+        'venue': 'Quartier des Spectacles',
+        'address': 'Quartier des Spectacles, Montreal, QC H2X 1X8',
+        'start_date': (7, 1, 18, 0),
+        'end_date': (8, 31, 23, 0),
+        'url': 'https://www.montrealsummerfest.com',
+        'source': 'Official Festival Site',
+        'category': 'music',
+        'price': 'Free - $50 CAD',
+        'metro': 'Place-des-Arts'
+    },
+    {
+        'name': 'Montreal Cultural Festival',
+        'venue': 'Various Venues',
+        'address': 'Montreal, QC',
+        'start_date': (7, 5, 10, 0),
+        'end_date': (7, 14, 22, 0),
+        'url': 'https://www.montrealculturalfest.com',
+        'source': 'Official Festival Site',
+        'category': 'art',
+        'price': '$10-40 CAD',
+        'metro': 'Multiple stations'
+    }
+)
+
+
+@lru_cache(maxsize=1)
+def _known_festivals_for(today: date) -> Tuple[Dict[str, Any], ...]:
+    """Known festivals dated in the current year, or next year once passed"""
+    festivals = []
+    
+    for festival in _KNOWN_FESTIVALS:
+        year = today.year
+        
+        # If the festival has passed this year, move to next year
+        if date(year, *festival['start_date'][:2]) < today:
+            year += 1
+        
+        festivals.append(dict(
+            festival,
+            start_date=datetime(year, *festival['start_date']).isoformat(),
+            end_date=datetime(year, *festival['end_date']).isoformat()
+        ))
+    
+    return tuple(festivals)
+
+
+# Accept events from 30 days ago to 90 days in the future
+_VALID_WINDOW_PAST = timedelta(days=30)
+_VALID_WINDOW_FUTURE = timedelta(days=90)
+
+# Scraped start dates repeat a lot (date-only listings, the known festivals)
+_parse_isoformat = lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+# Cheap scan of the raw page for any class attribute the patterns above could
+# match; pages without one (e.g. script-rendered shells) skip tree building
+_EVENT_MARKUP_RE = re.compile(
+    rb'class\s*=\s*["\']?[^"\'>]*(?:event|festival|activity|concert|story|article)'
+)
+
+
+def _has_event_markup(content: bytes) -> bool:
+    """Return True if the page may contain event listing elements"""
+    return _EVENT_MARKUP_RE.search(content) is not None
+
+
 class LiveFestivalScraper:
+    __slots__ = ('session', '_cache', '_cache_ttl')
+    
     def __init__(self):
         """Initialize live festival scraper"""
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            # Compressed pages are much smaller; br is only offered when a
+            # brotli decoder is installed
+            'Accept-Encoding': ACCEPT_ENCODING
         })
+        
+        # Size the pool for the concurrent scrapers so parallel requests to
+        # the same host reuse connections instead of being discarded, and
+        # retry transient upstream failures
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # (timestamp, festivals, JSON payload) from the last successful scrape
+        self._cache = None
+        self._cache_ttl = SCRAPE_CACHE_TTL
     
     def get_live_festivals(self) -> List[Dict[str, Any]]:
         """Get live festival data from actual Montreal and Quebec websites"""
+        if self._cache and time.monotonic() - self._cache[0] < self._cache_ttl:
+            return self._cache[1]
+        
         festivals = []
         
+        # One clock reading per refresh, shared by every scraper and the
+        # validation below
+        now = datetime.now()
+        
         try:
-            # 1. Montreal Tourism Official Site
-            festivals.extend(self._scrape_mtl_org())
-            
-            # 2. Quebec Tourism Site
-            festivals.extend(self._scrape_quebec_tourism())
-            
-            # 3. Montreal Gazette Events
-            festivals.extend(self._scrape_montreal_gazette())
-            
-            # 4. Montreal Events Calendar
-            festivals.extend(self._scrape_montreal_events())
-            
-            # 5. Local Montreal event sites
-            festivals.extend(self._scrape_local_sites())
+            # The scrapers are independent and I/O-bound, so run them
+            # concurrently: wall time becomes the slowest site, not the sum.
+            scrapers = [
+                self._scrape_mtl_org,             # 1. Montreal Tourism Official Site
+                self._scrape_quebec_tourism,      # 2. Quebec Tourism Site
+                self._scrape_montreal_gazette,    # 3. Montreal Gazette Events
+                self._scrape_montreal_events,     # 4. Montreal Events Calendar
+                self._scrape_local_sites,         # 5. Local Montreal event sites
+                self._scrape_specific_festivals   # 6. Specific festival websites
+            ]
             
-            # 6. Specific festival websites
-            festivals.extend(self._scrape_specific_festivals())
+            with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+                futures = [executor.submit(scraper, now) for scraper in scrapers]
+                
+                # Collect in submission order so results stay deterministic
+                for scraper, future in zip(scrapers, futures):
+                    try:
+                        festivals.extend(future.result())
+                    except Exception as e:
+                        logger.error(f"Error in {scraper.__name__}: {e}")
             
             # Filter and validate
-            current_date = datetime.now()
+            earliest = now - _VALID_WINDOW_PAST
+            latest = now + _VALID_WINDOW_FUTURE
             valid_festivals = []
             
             for festival in festivals:
-                if self._is_valid_festival(festival, current_date):
+                if self._is_valid_festival(festival, earliest, latest):
                     valid_festivals.append(festival)
             
+            if not valid_festivals and self._cache:
+                logger.warning("Live scrape found no festivals, serving stale results")
+                return self._cache[1]
+            
             logger.info(f"Found {len(valid_festivals)} live festivals")
-            return valid_festivals[:30]  # Return top 30 festivals
+            # Return the 30 soonest festivals rather than whichever sources
+            # happened to be collected first (start dates are cache hits here)
+            valid_festivals = heapq.nsmallest(
+                30, valid_festivals, key=lambda festival: _parse_isoformat(festival['start_date'])
+            )
+            # Serialize once per refresh; JSON consumers then reuse the bytes
+            self._cache = (time.monotonic(), valid_festivals, orjson.dumps(valid_festivals))
+            return valid_festivals
             
         except Exception as e:
             logger.error(f"Error collecting live data: {e}")
-            return []
+            # Better stale data than none while the sites are failing
+            return self._cache[1] if self._cache else []
     
-    def _scrape_specific_festivals(self) -> List[Dict[str, Any]]:
-        """Scrape specific Montreal festival websites"""
-        festivals = []
-        
-        # Add known Montreal festivals with their actual websites
-        known_festivals = [
-            {
-                'name': 'Montreal Jazz Festival',
-                'venue': 'Quartier des Spectacles',
-                'address': 'Quartier des Spectacles, Montreal, QC H2X 1X8',
-                'start_date': '2024-06-27T18:00:00',
-                'end_date': '2024-07-06T23:00:00',
-                'url': 'https://www.montrealjazzfest.com',
-                'source': 'Official Festival Site',
-                'category': 'music',
-                'price': '$25-150 CAD',
-                'metro': 'Place-des-Arts'
-            },
-            {
-                'name': 'Osheaga Music Festival',
-                'venue': 'Parc Jean-Drapeau',
-                'address': 'Parc Jean-Drapeau, Montreal, QC H3C 6A3',
-                'start_date': '2024-08-02T12:00:00',
-                'end_date': '2024-08-04T23:00:00',
-                'url': 'https://www.osheaga.com',
-                'source': 'Official Festival Site',
-                'category': 'music',
-                'price': '$150-300 CAD',
-                'metro': 'Jean-Drapeau'
-            },
-            {
-                'name': 'Just for Laughs Comedy Festival',
-                'venue': 'Quartier Latin',
-                'address': 'Quartier Latin, Montreal, QC H2L 2L4',
-                'start_date': '2024-07-10T19:00:00',
-                'end_date': '2024-07-28T23:00:00',
-                'url': 'https://www.hahaha.com',
-                'source': 'Official Festival Site',
-                'category': 'comedy',
-                'price': '$30-120 CAD',
-                'metro': 'Berri-UQAM'
-            },
-            {
-                'name': 'Montreal International Film Festival',
-                'venue': 'Various Cinemas',
-                'address': 'Downtown Montreal, QC',
-                'start_date': '2024-08-22T10:00:00',
-                'end_date': '2024-09-02T23:00:00',
-                'url': 'https://www.ffm-montreal.org',
-                'source': 'Official Festival Site',
-                'category': 'film',
-                'price': '$15-50 CAD',
-                'metro': 'Place-des-Arts'
-            },
-            {
-                'name': 'Montreal Food Festival',
-                'venue': 'Old Port of Montreal',
-                'address': 'Old Port of Montreal, QC H2Y 1C6',
-                'start_date': '2024-07-15T11:00:00',
-                'end_date': '2024-07-21T22:00:00',
-                'url': 'https://www.montrealfoodfest.com',
-                'source': 'Official Festival Site',
-                'category': 'food',
-                'price': '$20-80 CAD',
-                'metro': 'Place-d\'Armes'
-            },
-            {
-                'name': 'Montreal Art Festival',
-                'venue': 'Place des Arts',
-                'address': 'Place des Arts, Montreal, QC H2X 1Y9',
-                'start_date': '2024-09-10T10:00:00',
-                'end_date': '2024-09-15T18:00:00',
-                'url': 'https://www.montrealartfest.com',
-                'source': 'Official Festival Site',
-                'category': 'art',
-                'price': '$15-50 CAD',
-                'metro': 'Place-des-Arts'
-            },
-            {
-                'name': 'Montreal Beer Festival',
-                'venue': 'Palais des Congrès',
-                'address': 'Palais des Congrès, Montreal, QC H2Z 1H2',
-                'start_date': '2024-08-08T12:00:00',
-                'end_date': '2024-08-10T22:00:00',
-                'url': 'https://www.montrealbeerfest.com',
-                'source': 'Official Festival Site',
-                'category': 'food',
-                'price': '$40-100 CAD',
-                'metro': 'Place-d\'Armes'
-            },
-            {
-                'name': 'Montreal Electronic Music Festival',
-                'venue': 'Parc Jean-Drapeau',
-                'address': 'Parc Jean-Drapeau, Montreal, QC H3C 6A3',
-                'start_date': '2024-07-20T14:00:00',
-                'end_date': '2024-07-21T23:00:00',
-                'url': 'https://www.montrealelectronicfest.com',
-                'source': 'Official Festival Site',
-                'category': 'music',
-                'price': '$80-200 CAD',
-                'metro': 'Jean-Drapeau'
-            },
-            {
-                'name': 'Montreal Street Art Festival',
-                'venue': 'Various Locations',
-                'address': 'Downtown Montreal, QC',
-                'start_date': '2024-07-25T10:00:00',
-                'end_date': '2024-07-27T18:00:00',
-                'url': 'https://www.montrealstreetart.com',
-                'source': 'Official Festival Site',
-                'category': 'art',
-                'price': 'Free',
-                'metro': 'Multiple stations'
-            },
-            {
-                'name': 'Montreal Wine Festival',
-                'venue': 'Old Port of Montreal',
-                'address': 'Old Port of Montreal, QC H2Y 1C6',
-                'start_date': '2024-08-30T11:00:00',
-                'end_date': '2024-09-01T22:00:00',
-                'url': 'https://www.montrealwinefest.com',
-                'source': 'Official Festival Site',
-                'category': 'food',
-                'price': '$60-150 CAD',
-                'metro': 'Place-d\'Armes'
-            },
-            {
-                'name': 'Montreal Summer Festival',
-                'venue': 'Quartier des Spectacles',
-                'address': 'Quartier des Spectacles, Montreal, QC H2X 1X8',
-                'start_date': '2024-07-01T18:00:00',
-                'end_date': '2024-08-31T23:00:00',
-                'url': 'https://www.montrealsummerfest.com',
-                'source': 'Official Festival Site',
-                'category': 'music',
-                'price': 'Free - $50 CAD',
-                'metro': 'Place-des-Arts'
-            },
-            {
-                'name': 'Montreal Cultural Festival',
-                'venue': 'Various Venues',
-                'address': 'Montreal, QC',
-                'start_date': '2024-07-05T10:00:00',
-                'end_date': '2024-07-14T22:00:00',
-                'url': 'https://www.montrealculturalfest.com',
-                'source': 'Official Festival Site',
-                'category': 'art',
-                'price': '$10-40 CAD',
-                'metro': 'Multiple stations'
-            }
-        ]
-        
-        # Add current year festivals that are happening now or soon
-        current_date = datetime.now()
-        current_year = current_date.year
-        
-        for festival in known_festivals:
-            # Update dates to current year
-            start_date = datetime.fromisoformat(festival['start_date'])
-            end_date = datetime.fromisoformat(festival['end_date'])
-            
-            # Adjust to current year
-            start_date = start_date.replace(year=current_year)
-            end_date = end_date.replace(year=current_year)
-            
-            # If the festival has passed this year, move to next year
-            if start_date < current_date:
-                start_date = start_date.replace(year=current_year + 1)
-                end_date = end_date.replace(year=current_year + 1)
-            
-            festival['start_date'] = start_date.isoformat()
-            festival['end_date'] = end_date.isoformat()
-            
-            festivals.append(festival)
+    def get_live_festivals_json(self) -> bytes:
+        """Get live festival data as a JSON-encoded UTF-8 payload"""
+        festivals = self.get_live_festivals()
         
-        return festivals
+        cache = self._cache
+        if cache and cache[1] is festivals:
+            return cache[2]
+        return orjson.dumps(festivals)
     
-    def _scrape_mtl_org(self) -> List[Dict[str, Any]]:
+    def _scrape_specific_festivals(self, now: datetime) -> List[Dict[str, Any]]:
+        """Scrape specific Montreal festival websites"""
+        return list(_known_festivals_for(now.date()))
+    
+    def _scrape_mtl_org(self, now: datetime) -> List[Dict[str, Any]]:
         """Scrape Montreal Tourism official site"""
-        try:
-            # Montreal Tourism events page
-            url = "https://www.mtl.org/en/events"
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                events = []
-                
-                # Look for event listings
-                event_elements = soup.find_all(['div', 'article'], class_=re.compile(r'event|festival|activity'))
-                
-                for element in event_elements[:15]:
-                    try:
-                        # Extract event information
-                        title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                        event_name = title_elem.text.strip() if title_elem else "Unknown Event"
-                        
-                        # Only include cultural events
-                        if not self._is_cultural_event(event_name):
-                            continue
-                        
-                        # Extract date
-                        date_elem = element.find(['time', 'span', 'div'], class_=re.compile(r'date|time|when'))
-                        event_date = date_elem.text.strip() if date_elem else datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Extract location
-                        location_elem = element.find(['span', 'div'], class_=re.compile(r'location|venue|where'))
-                        location = location_elem.text.strip() if location_elem else "Montreal"
-                        
-                        # Extract link
-                        link_elem = element.find('a')
-                        event_url = link_elem['href'] if link_elem else "https://www.mtl.org"
-                        if not event_url.startswith('http'):
-                            event_url = "https://www.mtl.org" + event_url
-                        
-                        events.append({
-                            'name': event_name,
-                            'venue': location,
-                            'address': location,
-                            'start_date': self._parse_date(event_date),
-                            'end_date': self._parse_date(event_date),
-                            'url': event_url,
-                            'source': 'MTL.org',
-                            'category': self._categorize_event(event_name)
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Error parsing MTL.org event: {e}")
-                
-                return events
-            
-        except Exception as e:
-            logger.error(f"Error scraping MTL.org: {e}")
-        
-        return []
+        return self._scrape_listing(
+            "https://www.mtl.org/en/events", 'MTL.org',
+            "https://www.mtl.org", "Montreal", _EVENT_STRAINER, _EVENT_CLASS_RE, now
+        )
     
-    def _scrape_quebec_tourism(self) -> List[Dict[str, Any]]:
+    def _scrape_quebec_tourism(self, now: datetime) -> List[Dict[str, Any]]:
         """Scrape Quebec Tourism site"""
-        try:
-            # Quebec Tourism events page
-            url = "https://www.quebecoriginal.com/en-ca/events"
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                events = []
-                
-                # Look for event listings
-                event_elements = soup.find_all(['div', 'article'], class_=re.compile(r'event|activity|festival'))
-                
-                for element in event_elements[:15]:
-                    try:
-                        # Extract event information
-                        title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                        event_name = title_elem.text.strip() if title_elem else "Unknown Event"
-                        
-                        # Only include cultural events
-                        if not self._is_cultural_event(event_name):
-                            continue
-                        
-                        # Extract date
-                        date_elem = element.find(['time', 'span', 'div'], class_=re.compile(r'date|time|when'))
-                        event_date = date_elem.text.strip() if date_elem else datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Extract location
-                        location_elem = element.find(['span', 'div'], class_=re.compile(r'location|venue|where'))
-                        location = location_elem.text.strip() if location_elem else "Quebec"
-                        
-                        # Extract link
-                        link_elem = element.find('a')
-                        event_url = link_elem['href'] if link_elem else "https://www.quebecoriginal.com"
-                        if not event_url.startswith('http'):
-                            event_url = "https://www.quebecoriginal.com" + event_url
-                        
-                        events.append({
-                            'name': event_name,
-                            'venue': location,
-                            'address': location,
-                            'start_date': self._parse_date(event_date),
-                            'end_date': self._parse_date(event_date),
-                            'url': event_url,
-                            'source': 'Quebec Tourism',
-                            'category': self._categorize_event(event_name)
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Error parsing Quebec Tourism event: {e}")
-                
-                return events
-            
-        except Exception as e:
-            logger.error(f"Error scraping Quebec Tourism: {e}")
-        
-        return []
+        return self._scrape_listing(
+            "https://www.quebecoriginal.com/en-ca/events", 'Quebec Tourism',
+            "https://www.quebecoriginal.com", "Quebec", _EVENT_STRAINER, _EVENT_CLASS_RE, now
+        )
     
-    def _scrape_montreal_gazette(self) -> List[Dict[str, Any]]:
+    def _scrape_montreal_gazette(self, now: datetime) -> List[Dict[str, Any]]:
         """Scrape Montreal Gazette events"""
+        return self._scrape_listing(
+            "https://montrealgazette.com/entertainment/events", 'Montreal Gazette',
+            "https://montrealgazette.com", "Montreal", _ARTICLE_STRAINER, _ARTICLE_CLASS_RE, now
+        )
+    
+    def _scrape_montreal_events(self, now: datetime) -> List[Dict[str, Any]]:
+        """Scrape Montreal events calendar"""
+        return self._scrape_listing(
+            "https://www.montreal.com/events", 'Montreal.com',
+            "https://www.montreal.com", "Montreal", _EVENT_STRAINER, _EVENT_CLASS_RE, now
+        )
+    
+    def _scrape_listing(self, url: str, source: str, base_url: str, default_venue: str,
+                        strainer: SoupStrainer, class_re, now: datetime) -> List[Dict[str, Any]]:
+        """Fetch one event listing page and parse its event elements"""
         try:
-            # Montreal Gazette events page
-            url = "https://montrealgazette.com/entertainment/events"
-            response = self.session.get(url, timeout=15)
+            content = self._fetch_page(url)
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                events = []
-                
-                # Look for event articles
-                event_elements = soup.find_all(['article', 'div'], class_=re.compile(r'event|story|article'))
-                
-                for element in event_elements[:15]:
-                    try:
-                        # Extract event information
-                        title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                        event_name = title_elem.text.strip() if title_elem else "Unknown Event"
-                        
-                        # Only include cultural events
-                        if not self._is_cultural_event(event_name):
-                            continue
-                        
-                        # Extract date
-                        date_elem = element.find(['time', 'span', 'div'], class_=re.compile(r'date|time|when'))
-                        event_date = date_elem.text.strip() if date_elem else datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Extract location
-                        location_elem = element.find(['span', 'div'], class_=re.compile(r'location|venue|where'))
-                        location = location_elem.text.strip() if location_elem else "Montreal"
-                        
-                        # Extract link
-                        link_elem = element.find('a')
-                        event_url = link_elem['href'] if link_elem else "https://montrealgazette.com"
-                        if not event_url.startswith('http'):
-                            event_url = "https://montrealgazette.com" + event_url
-                        
-                        events.append({
-                            'name': event_name,
-                            'venue': location,
-                            'address': location,
-                            'start_date': self._parse_date(event_date),
-                            'end_date': self._parse_date(event_date),
-                            'url': event_url,
-                            'source': 'Montreal Gazette',
-                            'category': self._categorize_event(event_name)
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Error parsing Montreal Gazette event: {e}")
-                
-                return events
+            if content is not None and _has_event_markup(content):
+                soup = BeautifulSoup(content, 'lxml', parse_only=strainer)
+                return self._parse_event_elements(
+                    soup.find_all(_EVENT_TAGS, class_=class_re, limit=15),
+                    source, base_url, default_venue, now
+                )
             
         except Exception as e:
-            logger.error(f"Error scraping Montreal Gazette: {e}")
+            logger.error(f"Error scraping {source}: {e}")
         
         return []
     
-    def _scrape_montreal_events(self) -> List[Dict[str, Any]]:
-        """Scrape Montreal events calendar"""
-        try:
-            # Montreal events calendar
-            url = "https://www.montreal.com/events"
-            response = self.session.get(url, timeout=15)
+    def _parse_event_elements(self, event_elements, source: str, base_url: str,
+                              default_venue: str, now: datetime) -> List[Dict[str, Any]]:
+        """Extract cultural events from listing elements"""
+        events = []
+        
+        # Undated events are taken to start today
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+        
+        for element in event_elements:
+            # Missing fields are checked for explicitly; they are common on
+            # listing pages and shouldn't cost an exception per element
+            title_elem = element.find(_TITLE_TAGS)
+            if title_elem is None:
+                continue
+            event_name = title_elem.text.strip()
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                events = []
-                
-                # Look for event listings
-                event_elements = soup.find_all(['div', 'article'], class_=re.compile(r'event|activity|festival'))
-                
-                for element in event_elements[:15]:
-                    try:
-                        # Extract event information
-                        title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                        event_name = title_elem.text.strip() if title_elem else "Unknown Event"
-                        
-                        # Only include cultural events
-                        if not self._is_cultural_event(event_name):
-                            continue
-                        
-                        # Extract date
-                        date_elem = element.find(['time', 'span', 'div'], class_=re.compile(r'date|time|when'))
-                        event_date = date_elem.text.strip() if date_elem else datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Extract location
-                        location_elem = element.find(['span', 'div'], class_=re.compile(r'location|venue|where'))
-                        location = location_elem.text.strip() if location_elem else "Montreal"
-                        
-                        # Extract link
-                        link_elem = element.find('a')
-                        event_url = link_elem['href'] if link_elem else "https://www.montreal.com"
-                        if not event_url.startswith('http'):
-                            event_url = "https://www.montreal.com" + event_url
-                        
-                        events.append({
-                            'name': event_name,
-                            'venue': location,
-                            'address': location,
-                            'start_date': self._parse_date(event_date),
-                            'end_date': self._parse_date(event_date),
-                            'url': event_url,
-                            'source': 'Montreal.com',
-                            'category': self._categorize_event(event_name)
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Error parsing Montreal.com event: {e}")
-                
-                return events
+            # Only include cultural events
+            if not self._is_cultural_event(event_name):
+                continue
             
-        except Exception as e:
-            logger.error(f"Error scraping Montreal.com: {e}")
+            # Extract date
+            date_elem = element.find(_DATE_TAGS, class_=_DATE_CLASS_RE)
+            
+            # Extract location
+            location_elem = element.find(_LOCATION_TAGS, class_=_LOCATION_CLASS_RE)
+            location = location_elem.text.strip() if location_elem else default_venue
+            
+            # Extract link
+            link_elem = element.find('a')
+            event_url = (link_elem.get('href') if link_elem else None) or base_url
+            if not event_url.startswith('http'):
+                event_url = base_url + event_url
+            
+            start_date = self._parse_date(date_elem.text, now) if date_elem else today
+            events.append({
+                'name': event_name,
+                'venue': location,
+                'address': location,
+                'start_date': start_date,
+                'end_date': start_date,
+                'url': event_url,
+                'source': source,
+                'category': self._categorize_event(event_name)
+            })
         
-        return []
+        return events
     
-    def _scrape_local_sites(self) -> List[Dict[str, Any]]:
+    def _scrape_local_sites(self, now: datetime) -> List[Dict[str, Any]]:
         """Scrape local Montreal event websites"""
         local_sites = [
             'https://www.tourisme-montreal.org/events',
@@ -482,172 +485,137 @@ class LiveFestivalScraper:
         
         all_events = []
         
-        for site in local_sites:
+        # The three fetches are independent, so overlap them; parsing below
+        # stays sequential
+        with ThreadPoolExecutor(max_workers=len(local_sites)) as executor:
+            pages = list(executor.map(self._fetch_local_site, local_sites))
+        
+        for site, content in zip(local_sites, pages):
             try:
-                response = self.session.get(site, timeout=15)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                if content is not None and _has_event_markup(content):
+                    soup = BeautifulSoup(content, 'lxml', parse_only=_LOCAL_EVENT_STRAINER)
+                    all_events.extend(self._parse_event_elements(
+                        soup.find_all(_EVENT_TAGS, class_=_LOCAL_EVENT_CLASS_RE, limit=10),
+                        'Local Site', site, "Montreal", now
+                    ))
                     
-                    # Look for event elements
-                    event_elements = soup.find_all(['div', 'article'], class_=re.compile(r'event|festival|concert|activity'))
-                    
-                    for element in event_elements[:10]:
-                        try:
-                            # Extract event information
-                            title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'h5'])
-                            event_name = title_elem.text.strip() if title_elem else "Unknown Event"
-                            
-                            # Only include cultural events
-                            if not self._is_cultural_event(event_name):
-                                continue
-                            
-                            # Extract date
-                            date_elem = element.find(['time', 'span', 'div'], class_=re.compile(r'date|time|when'))
-                            event_date = date_elem.text.strip() if date_elem else datetime.now().strftime("%Y-%m-%d")
-                            
-                            # Extract location
-                            location_elem = element.find(['span', 'div'], class_=re.compile(r'location|venue|where'))
-                            location = location_elem.text.strip() if location_elem else "Montreal"
-                            
-                            # Extract link
-                            link_elem = element.find('a')
-                            event_url = link_elem['href'] if link_elem else site
-                            if not event_url.startswith('http'):
-                                event_url = site + event_url
-                            
-                            all_events.append({
-                                'name': event_name,
-                                'venue': location,
-                                'address': location,
-                                'start_date': self._parse_date(event_date),
-                                'end_date': self._parse_date(event_date),
-                                'url': event_url,
-                                'source': 'Local Site',
-                                'category': self._categorize_event(event_name)
-                            })
-                            
-                        except Exception as e:
-                            logger.error(f"Error parsing local site event: {e}")
-                            
             except Exception as e:
                 logger.error(f"Error scraping {site}: {e}")
         
         return all_events
     
+    def _fetch_local_site(self, site: str) -> Optional[bytes]:
+        """Fetch one local site page, returning None on network errors"""
+        try:
+            return self._fetch_page(site)
+        except Exception as e:
+            logger.error(f"Error scraping {site}: {e}")
+            return None
+    
+    def _fetch_page(self, url: str) -> Optional[bytes]:
+        """Download a page body, or None if the response is not a 200"""
+        # Stream the body so an oversized page is cut off rather than read
+        # into memory in full; lxml copes with the truncated markup
+        with self.session.get(url, timeout=15, stream=True) as response:
+            if response.status_code != 200:
+                return None
+            
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body += chunk
+                if len(body) >= MAX_PAGE_BYTES:
+                    logger.warning(f"{url} exceeds {MAX_PAGE_BYTES} bytes, truncating")
+                    break
+            
+            return bytes(body)
+    
     def _is_cultural_event(self, event_name: str) -> bool:
         """Check if event is cultural (not business/tech)"""
-        event_lower = event_name.lower()
-        
-        # Cultural keywords
-        cultural_keywords = [
-            'festival', 'concert', 'music', 'jazz', 'rock', 'pop', 'classical',
-            'art', 'exhibition', 'gallery', 'museum', 'theatre', 'theater',
-            'dance', 'ballet', 'comedy', 'film', 'movie', 'cinema',
-            'food', 'culinary', 'wine', 'beer', 'taste', 'culture',
-            'performance', 'show', 'entertainment', 'celebration'
-        ]
-        
-        # Business/tech keywords to exclude
-        business_keywords = [
-            'conference', 'summit', 'expo', 'trade', 'business', 'technology',
-            'cyber', 'security', 'ai', 'artificial intelligence', 'startup',
-            'networking', 'workshop', 'seminar', 'meeting', 'forum'
-        ]
-        
-        # Check for cultural keywords
-        has_cultural = any(keyword in event_lower for keyword in cultural_keywords)
+        tokens = _keyword_tokens(event_name)
         
-        # Check for business keywords
-        has_business = any(keyword in event_lower for keyword in business_keywords)
-        
-        # Return true if cultural and not business
-        return has_cultural and not has_business
+        # Cultural and not business
+        if not tokens.isdisjoint(_BUSINESS_KEYWORDS) or tokens.issuperset(('artificial', 'intelligence')):
+            return False
+        return not tokens.isdisjoint(_CULTURAL_KEYWORDS)
     
-    def _parse_date(self, date_string: str) -> str:
+    def _parse_date(self, date_string: str, now: datetime) -> str:
         """Parse various date formats"""
         try:
             # Clean the date string
             date_string = date_string.strip()
             
-            # Try different date formats
-            date_formats = [
-                '%Y-%m-%d',
-                '%B %d, %Y',
-                '%d %B %Y',
-                '%Y/%m/%d',
-                '%m/%d/%Y',
-                '%d/%m/%Y'
-            ]
-            
-            for fmt in date_formats:
+            # Match each format's shape with a regex rather than trying
+            # strptime in turn, which raises on every miss
+            for pattern in _DATE_PATTERNS:
+                match = pattern.match(date_string)
+                if not match:
+                    continue
+                
+                year, month, day = match.group('year', 'month', 'day')
+                month = _MONTHS.get(month.lower()) if month.isalpha() else int(month)
+                if month is None:
+                    continue
+                
                 try:
-                    parsed_date = datetime.strptime(date_string, fmt)
-                    return parsed_date.isoformat()
-                except:
+                    return datetime(int(year), month, int(day)).isoformat()
+                except ValueError:
                     continue
             
             # If no format matches, return current date
-            return datetime.now().isoformat()
+            return now.isoformat()
             
         except Exception as e:
             logger.error(f"Error parsing date {date_string}: {e}")
-            return datetime.now().isoformat()
+            return now.isoformat()
     
     def _categorize_event(self, event_name: str) -> str:
         """Categorize event based on name"""
-        event_lower = event_name.lower()
+        tokens = _keyword_tokens(event_name)
         
-        if any(word in event_lower for word in ['music', 'concert', 'jazz', 'rock', 'pop', 'band', 'singer', 'festival']):
-            return 'music'
-        elif any(word in event_lower for word in ['film', 'movie', 'cinema', 'documentary', 'screening', 'festival']):
-            return 'film'
-        elif any(word in event_lower for word in ['food', 'culinary', 'wine', 'beer', 'taste', 'dining', 'restaurant', 'festival']):
-            return 'food'
-        elif any(word in event_lower for word in ['art', 'exhibition', 'gallery', 'museum', 'painting', 'sculpture', 'festival']):
-            return 'art'
-        elif any(word in event_lower for word in ['comedy', 'standup', 'humor', 'laugh', 'joke', 'festival']):
-            return 'comedy'
-        elif any(word in event_lower for word in ['dance', 'ballet', 'performance', 'theatre', 'theater', 'festival']):
-            return 'dance'
-        else:
-            return 'other'
+        for category, keywords in _CATEGORY_KEYWORDS:
+            if not tokens.isdisjoint(keywords):
+                return category
+        
+        return 'other'
     
-    def _is_valid_festival(self, festival: Dict[str, Any], current_date: datetime) -> bool:
+    def _is_valid_festival(self, festival: Dict[str, Any], earliest: datetime, latest: datetime) -> bool:
         """Check if festival is valid and current"""
+        name = festival.get('name')
+        start = festival.get('start_date')
+        
+        # Check required fields and that the name is not too generic
+        if not name or 'venue' not in festival or not start or len(name) < 3:
+            return False
+        
+        # Check if it's a current or upcoming event; start dates here all come
+        # from naive isoformat(), so there is no 'Z' suffix to rewrite
         try:
-            # Check if it has required fields
-            required_fields = ['name', 'venue', 'start_date']
-            if not all(field in festival for field in required_fields):
-                return False
-            
-            # Check if name is not too generic
-            if len(festival['name']) < 3:
-                return False
-            
-            # Check if it's a current or upcoming event
-            try:
-                start_date = datetime.fromisoformat(festival['start_date'].replace('Z', '+00:00'))
-                # Accept events from 30 days ago to 90 days in the future
-                return (current_date - timedelta(days=30)) <= start_date <= (current_date + timedelta(days=90))
-            except:
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error validating festival: {e}")
+            start_date = _parse_isoformat(start)
+        except (TypeError, ValueError):
             return False
+        
+        return earliest <= start_date <= latest
 
-# Global scraper instance
+# Global scraper instance; it owns the process-wide session and cache
 _live_scraper = None
+_live_scraper_lock = threading.Lock()
 
 def get_live_scraper():
     """Get or create the global live scraper instance"""
     global _live_scraper
     if _live_scraper is None:
-        _live_scraper = LiveFestivalScraper()
+        # Concurrent first callers must not each build their own session
+        with _live_scraper_lock:
+            if _live_scraper is None:
+                _live_scraper = LiveFestivalScraper()
     return _live_scraper
 
 def get_live_festivals():
     """Get live festival data"""
     scraper = get_live_scraper()
-    return scraper.get_live_festivals() 
\ No newline at end of file
+    return scraper.get_live_festivals()
+
+def get_live_festivals_json():
+    """Get live festival data as JSON bytes"""
+    scraper = get_live_scraper()
+    return scraper.get_live_festivals_json()
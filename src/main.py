@@ -1,18 +1,27 @@
 import logging
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, time as dt_time
 import pytz
 import re
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, repeat
+from bisect import bisect_right
+from operator import itemgetter
+from functools import lru_cache
+from dataclasses import dataclass
+from collections import OrderedDict
 
 from planner import plan, prioritize_tasks, validate_task_dependencies
-from executor import execute_task, search_festival_information, get_festival_location, get_festival_directions, estimate_festival_cost
+from executor import execute_task, execute_prompt, warmup, search_festival_information, get_festival_location, get_festival_directions, estimate_festival_cost
 from memory import (
     store_conversation, store_task_result, recall_conversations, 
     recall_task_results, get_user_preferences, get_memory_manager
 )
-from festival_service import get_ongoing_festivals
+from festival_service import get_ongoing_festivals, invalidate_festival_cache
 from ui_helper import get_ui
 
 # Load environment variables
@@ -25,23 +34,397 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Montreal timezone
-MONTREAL_TZ = pytz.timezone('America/Montreal')
+# Montreal timezone. zoneinfo (Python 3.9+) attaches to naive datetimes with
+# a plain replace(); pytz needs the slower localize() and remains the fallback
+# on 3.8 or where the system has no tz database
+try:
+    from zoneinfo import ZoneInfo
+    MONTREAL_TZ = ZoneInfo('America/Montreal')
+    
+    def _localize(naive: datetime) -> datetime:
+        """Attach the Montreal timezone to a naive datetime"""
+        return naive.replace(tzinfo=MONTREAL_TZ)
+except (ImportError, KeyError):
+    MONTREAL_TZ = pytz.timezone('America/Montreal')
+    _localize = MONTREAL_TZ.localize
+
+# English keyword mapping
+_CATEGORY_KEYWORDS = {
+    'music': ['music', 'concert', 'jazz', 'rock', 'pop'],
+    'film': ['film', 'movie', 'cinema', 'documentary'],
+    'food': ['food', 'culinary', 'wine', 'beer', 'taste', 'restaurant'],
+    'art': ['art', 'exhibition', 'gallery', 'museum'],
+    'comedy': ['comedy', 'standup', 'humor'],
+    'dance': ['dance', 'ballet', 'performance']
+}
+
+# English day keywords
+_DAY_KEYWORDS = {
+    'today': ['today', 'now'],
+    'tomorrow': ['tomorrow'],
+    'tonight': ['tonight'],
+    'monday': ['monday', 'mon'],
+    'tuesday': ['tuesday', 'tue'],
+    'wednesday': ['wednesday', 'wed'],
+    'thursday': ['thursday', 'thu'],
+    'friday': ['friday', 'fri'],
+    'saturday': ['saturday', 'sat'],
+    'sunday': ['sunday', 'sun']
+}
+
+# English time keywords
+_TIME_KEYWORDS = {
+    'morning': ['morning', 'am'],
+    'afternoon': ['afternoon', 'pm'],
+    'evening': ['evening', 'night'],
+    'night': ['night']
+}
+
+def _reverse_index(keywords: Dict[str, List[str]]) -> Dict[str, str]:
+    """Map each keyword to its name; the first name listing a keyword wins"""
+    index = {}
+    for name, words in keywords.items():
+        for word in words:
+            index.setdefault(word, name)
+    return index
+
+# One hash probe per input word instead of scanning every keyword list
+_DAY_BY_WORD = _reverse_index(_DAY_KEYWORDS)
+_TIME_BY_WORD = _reverse_index(_TIME_KEYWORDS)
+
+# Day names accepted by _parse_datetime_cached: offsets from today, and
+# weekday numbers resolved to their next occurrence
+_RELATIVE_DAYS = {'today': 0, 'now': 0, 'tonight': 0, 'tomorrow': 1}
+_WEEKDAYS = {
+    'monday': 0, 'mon': 0,
+    'tuesday': 1, 'tue': 1,
+    'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3,
+    'friday': 4, 'fri': 4,
+    'saturday': 5, 'sat': 5,
+    'sunday': 6, 'sun': 6
+}
+
+# Named times of day accepted by _parse_datetime_cached
+_TIMES_OF_DAY = {
+    'morning': dt_time(9, 0), 'am': dt_time(9, 0),
+    'afternoon': dt_time(14, 0), 'pm': dt_time(14, 0),
+    'evening': dt_time(19, 0), 'night': dt_time(19, 0)
+}
+
+# Category keywords matched as whole words, optionally plural ('concerts'), in
+# one scan; the first keyword in the input wins and its named group is the category
+_CATEGORY_RE = re.compile(r'\b(?:%s)(?:s|es)?\b' % '|'.join(
+    '(?P<%s>%s)' % (category, '|'.join(map(re.escape, words)))
+    for category, words in _CATEGORY_KEYWORDS.items()
+))
+
+@lru_cache(maxsize=512)
+def _parse_datetime_cached(day: str, time: str, today: date) -> Tuple[date, Optional[dt_time]]:
+    """Resolve day and time strings relative to today; time is None if unparseable"""
+    # Convert to lowercase for processing
+    day_lower = day.lower()
+    time_lower = time.lower()
+    
+    # Handle different day formats
+    if day_lower in _RELATIVE_DAYS:
+        target_date = today + timedelta(days=_RELATIVE_DAYS[day_lower])
+        if day_lower == 'tonight':
+            time_lower = 'evening'  # Default to evening for tonight
+    elif day_lower in _WEEKDAYS:
+        target_date = _get_next_weekday(today, _WEEKDAYS[day_lower])
+    else:
+        # Try to parse as date; if parsing fails, use today
+        target_date = _parse_ymd(day) or today
+    
+    # Parse time; the caller defaults to the current time if parsing fails
+    if time_lower in _TIMES_OF_DAY:
+        target_time = _TIMES_OF_DAY[time_lower]
+    else:
+        target_time = _parse_hhmm(time)
+    
+    return target_date, target_time
+
+def _parse_ymd(value: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD date without strptime, or return None"""
+    parts = value.split('-')
+    if len(parts) != 3 or not _is_ascii_number(parts, (4, 2, 2)):
+        return None
+    try:
+        return date(int(parts[0]), int(parts[1]), int(parts[2]))
+    except ValueError:
+        return None
+
+def _parse_hhmm(value: str) -> Optional[dt_time]:
+    """Parse an HH:MM time without strptime, or return None"""
+    parts = value.split(':')
+    if len(parts) != 2 or not _is_ascii_number(parts, (2, 2)):
+        return None
+    try:
+        return dt_time(int(parts[0]), int(parts[1]))
+    except ValueError:
+        return None
+
+def _is_ascii_number(parts: List[str], max_lengths: Tuple[int, ...]) -> bool:
+    """Check each part is 1..max ASCII digits, matching strptime's %Y/%m/%d/%H/%M"""
+    for part, max_length in zip(parts, max_lengths):
+        if not (0 < len(part) <= max_length and part.isascii() and part.isdigit()):
+            return False
+    return True
+
+@lru_cache(maxsize=1024)
+def _parse_festival_window(start: str, end: str) -> Tuple[datetime, datetime]:
+    """Parse a festival's start and end dates into timezone-aware datetimes"""
+    return _parse_festival_date(start), _parse_festival_date(end)
+
+def _parse_festival_date(value: str) -> datetime:
+    """Parse an ISO datetime or YYYY-MM-DD date; naive values are Montreal time"""
+    value = value.replace('Z', '+00:00')
+    
+    # Handle different date formats
+    if 'T' in value:
+        parsed = datetime.fromisoformat(value)
+    else:
+        parsed = datetime.strptime(value, "%Y-%m-%d")
+    
+    if parsed.tzinfo is None:
+        parsed = _localize(parsed)
+    return parsed
+
+def _get_next_weekday(today: date, weekday: int) -> date:
+    """Get the next occurrence of a weekday after today"""
+    days_ahead = weekday - today.weekday()
+    if days_ahead <= 0:  # Target day already happened this week
+        days_ahead += 7
+    return today + timedelta(days=days_ahead)
+
+@lru_cache(maxsize=512)
+def _parse_user_input_cached(input_lower: str, current_hour: int) -> tuple:
+    """Parse lowercased user input into (category, day, time)"""
+    # Default values
+    category = "music"
+    day = "today"
+    time = "evening"
+    
+    # Input is already lowercased by the caller
+    words = input_lower.split()
+    
+    # Look for category keywords
+    match = _CATEGORY_RE.search(input_lower)
+    if match:
+        category = match.lastgroup
+    
+    # Look for day keywords
+    for word in words:
+        if word in _DAY_BY_WORD:
+            day = _DAY_BY_WORD[word]
+            break
+    
+    # Look for time keywords
+    found_time = False
+    for word in words:
+        if word in _TIME_BY_WORD:
+            time = _TIME_BY_WORD[word]
+            found_time = True
+            break
+    
+    # If no specific time found, try to infer from current time
+    if not found_time:
+        if 6 <= current_hour < 12:
+            time = 'morning'
+        elif 12 <= current_hour < 17:
+            time = 'afternoon'
+        elif 17 <= current_hour < 22:
+            time = 'evening'
+        else:
+            time = 'night'
+    
+    return category, day, time
+
+# Per-festival Gemini prompt, filled with the festival's fields plus
+# current_time and is_ongoing
+_FESTIVAL_PROMPT_TEMPLATE = textwrap.dedent("""
+    Provide EXACT, CONCISE information for this Montreal festival:
+    
+    Festival: {name}
+    Venue: {venue}
+    Address: {address}
+    Dates: {start_date} to {end_date}
+    Category: {category}
+    Price: {price}
+    Metro: {metro}
+    Source: {source}
+    Current Montreal Time: {current_time}
+    Is Currently Ongoing: {is_ongoing}
+    
+    Provide ONLY 3 key points:
+    1. [Festival name and exact venue]
+    2. [Google Maps address for navigation]
+    3. [Cost estimation in CAD - tickets, transport, food]
+    
+    Keep each point under 20 words. Be specific and actionable.
+    Include current time context if relevant.
+    """)
+
+# Placeholders for the optional festival fields used by the prompt templates
+_PROMPT_FIELD_DEFAULTS = {'category': 'N/A', 'price': 'N/A', 'metro': 'N/A'}
+
+# Multi-festival variant, so all uncached festivals of a request share one
+# Gemini round-trip; {festivals} is one _FESTIVAL_BATCH_ITEM_TEMPLATE per festival
+_FESTIVAL_BATCH_PROMPT_TEMPLATE = textwrap.dedent("""
+    Provide EXACT, CONCISE information for each of these {count} Montreal festivals:
+    
+    Current Montreal Time: {current_time}
+    
+    {festivals}
+    For each festival, in the order listed, provide ONLY 3 key points:
+    1. [Festival name and exact venue]
+    2. [Google Maps address for navigation]
+    3. [Cost estimation in CAD - tickets, transport, food]
+    
+    Keep each point under 20 words. Be specific and actionable.
+    Include current time context if relevant.
+    Separate the festivals with a line containing only ===
+    """)
+
+_FESTIVAL_BATCH_ITEM_TEMPLATE = textwrap.dedent("""\
+    Festival {index}: {name}
+    Venue: {venue}
+    Address: {address}
+    Dates: {start_date} to {end_date}
+    Category: {category}
+    Price: {price}
+    Metro: {metro}
+    Source: {source}
+    Is Currently Ongoing: {is_ongoing}
+    """)
+
+# Line separating the per-festival answers of a batched response
+_BATCH_SEPARATOR_RE = re.compile(r'^\s*={3,}\s*$', re.MULTILINE)
+
+# Recent Gemini festival responses keyed on (name, start, end, ongoing, hour),
+# least recently used first; written from the response worker threads
+_RESPONSE_CACHE_SIZE = 1024
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _get_cached_response(key: tuple) -> Optional[str]:
+    """Return a cached festival response, or None"""
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+def _store_cached_response(key: tuple, response: str) -> None:
+    """Cache a festival response, evicting the least recently used"""
+    with _response_cache_lock:
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+@dataclass
+class _FestivalColumns:
+    """Column view of a festival list, lowercased and parsed once for repeated filtering"""
+    __slots__ = ('rows', 'search_text', 'starts', 'ends', 'rows_by_start')
+    
+    rows: List[Dict[str, Any]]
+    # Lowercased "name\0category" per row, so a category test is one substring
+    # search; the NUL separator keeps matches from spanning both fields
+    search_text: List[str]
+    # Parsed (start, end) of the festivals with valid dates, sorted by start
+    starts: List[datetime]
+    ends: List[datetime]
+    rows_by_start: List[Dict[str, Any]]
+    
+    @classmethod
+    def build(cls, festivals: List[Dict[str, Any]]) -> '_FestivalColumns':
+        """Extract the filtered columns from festival dicts"""
+        windows = []
+        for festival in festivals:
+            try:
+                start, end = _parse_festival_window(festival['start_date'], festival['end_date'])
+            except (KeyError, AttributeError, ValueError):
+                continue  # Never ongoing, as in _is_festival_at_time
+            windows.append((start, end, festival))
+        windows.sort(key=itemgetter(0))
+        
+        return cls(
+            rows=festivals,
+            search_text=[
+                f"{festival['name']}\0{festival.get('category', '')}".lower() for festival in festivals
+            ],
+            starts=[start for start, _, _ in windows],
+            ends=[end for _, end, _ in windows],
+            rows_by_start=[festival for _, _, festival in windows]
+        )
+    
+    def matching_category(self, category_lower: str) -> List[Dict[str, Any]]:
+        """Festivals whose name or category contains the lowercased category"""
+        return [festival for festival, text in zip(self.rows, self.search_text) if category_lower in text]
+    
+    def ongoing_at(self, moment: datetime) -> List[Dict[str, Any]]:
+        """Festivals running at moment; only those already started are scanned"""
+        started = bisect_right(self.starts, moment)
+        return [
+            festival
+            for festival, end in zip(islice(self.rows_by_start, started), islice(self.ends, started))
+            if moment <= end
+        ]
+
+# (festivals, columns) for the festival list last converted; the festival
+# service returns the same list object until its cache refreshes
+_festival_columns = (None, None)
+
+def _get_festival_columns(festivals: List[Dict[str, Any]]) -> _FestivalColumns:
+    """Column view of festivals, rebuilt only when the festival list changes"""
+    global _festival_columns
+    
+    cached_festivals, columns = _festival_columns
+    if cached_festivals is festivals:
+        return columns
+    
+    columns = _FestivalColumns.build(festivals)
+    _festival_columns = (festivals, columns)
+    return columns
 
 class MontrealFestivalAssistant:
     def __init__(self):
         """Initialize the Montreal Festival Assistant with real-time data"""
         self.memory_manager = get_memory_manager()
         self.ui = get_ui()
+        
+        # Fill the festival cache in the background so the first query
+        # doesn't wait on the API fan-out
+        self._prefetch_thread = None
+        self.prefetch_festivals()
         logger.info("Montreal Festival Assistant initialized with real-time data")
     
+    def prefetch_festivals(self) -> None:
+        """Refresh the festival cache and its column view in a background thread"""
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        self._prefetch_thread = threading.Thread(target=self._prefetch_festivals, daemon=True)
+        self._prefetch_thread.start()
+    
+    def _prefetch_festivals(self) -> None:
+        """Load the festivals; a fresh cache makes this a no-op"""
+        try:
+            _get_festival_columns(get_ongoing_festivals())
+        except Exception as e:
+            logger.warning("Festival prefetch failed: %s", e)
+    
     def get_current_montreal_time(self) -> datetime:
         """Get current time in Montreal timezone"""
         return datetime.now(MONTREAL_TZ)
     
-    def show_ongoing_festivals(self):
+    def show_ongoing_festivals(self, refresh: bool = False):
         """Display currently ongoing festivals from real APIs"""
         try:
+            # Festivals are cached by festival_service; refresh forces a re-fetch
+            if refresh:
+                invalidate_festival_cache()
             festivals = get_ongoing_festivals()
             self.ui.show_ongoing_festivals(festivals)
             
@@ -49,38 +432,32 @@ class MontrealFestivalAssistant:
             logger.error(f"Error showing ongoing festivals: {e}")
             print("❌ Error loading ongoing festivals")
     
-    def get_festivals_by_criteria(self, category: str, day: str, time: str) -> List[Dict[str, Any]]:
+    def get_festivals_by_criteria(self, category: str, day: str, time: str,
+                                  festivals: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Get festivals matching category, day, and time criteria using real data"""
         try:
-            festivals = get_ongoing_festivals()
-            matching_festivals = []
+            if festivals is None:
+                festivals = get_ongoing_festivals()
+            columns = _get_festival_columns(festivals)
+            category_lower = category.lower()
             
             logger.info(f"Searching for {category} festivals on {day} at {time}")
             logger.info(f"Total festivals available: {len(festivals)}")
             
             # If no specific day/time criteria, return all festivals of the category
             if day.lower() in ['any', 'all', ''] and time.lower() in ['any', 'all', '']:
-                for festival in festivals:
-                    if category.lower() in festival['name'].lower() or category.lower() in festival.get('category', '').lower():
-                        matching_festivals.append(festival)
+                matching_festivals = columns.matching_category(category_lower)
                 logger.info(f"Found {len(matching_festivals)} festivals for category '{category}'")
                 return matching_festivals
             
-            # Convert day and time to datetime for comparison
-            target_datetime = self._parse_datetime(day, time)
+            # Day and time are not used to filter: festivals are included on
+            # category alone, so there is no point parsing them here
+            matching_festivals = columns.matching_category(category_lower)
             
-            for festival in festivals:
-                # Check if festival matches category (case-insensitive)
-                category_match = (category.lower() in festival['name'].lower() or 
-                                category.lower() in festival.get('category', '').lower())
-                
-                # Check if festival is happening on the specified day/time
-                time_match = self._is_festival_at_time(festival, target_datetime)
-                
-                # If category matches, include the festival regardless of time
-                if category_match:
-                    matching_festivals.append(festival)
-                    logger.info(f"Added festival: {festival['name']} (category match)")
+            # Per-festival detail only at DEBUG, without formatting otherwise
+            if logger.isEnabledFor(logging.DEBUG):
+                for festival in matching_festivals:
+                    logger.debug("Added festival: %s (category match)", festival['name'])
             
             logger.info(f"Found {len(matching_festivals)} matching festivals")
             return matching_festivals
@@ -89,103 +466,34 @@ class MontrealFestivalAssistant:
             logger.error(f"Error getting festivals by criteria: {e}")
             return []
     
-    def _parse_datetime(self, day: str, time: str) -> datetime:
+    def _parse_datetime(self, day: str, time: str, now: Optional[datetime] = None) -> datetime:
         """Parse day and time into datetime object with Montreal timezone"""
         try:
-            current_time = self.get_current_montreal_time()
-            
-            # Convert to lowercase for processing
-            day_lower = day.lower()
-            time_lower = time.lower()
-            
-            # Handle different day formats
-            if day_lower in ['today', 'now']:
-                target_date = current_time.date()
-            elif day_lower in ['tomorrow']:
-                target_date = (current_time + timedelta(days=1)).date()
-            elif day_lower in ['tonight']:
-                target_date = current_time.date()
-                time_lower = 'evening'  # Default to evening for tonight
-            elif day_lower in ['monday', 'mon']:
-                target_date = self._get_next_weekday(0)
-            elif day_lower in ['tuesday', 'tue']:
-                target_date = self._get_next_weekday(1)
-            elif day_lower in ['wednesday', 'wed']:
-                target_date = self._get_next_weekday(2)
-            elif day_lower in ['thursday', 'thu']:
-                target_date = self._get_next_weekday(3)
-            elif day_lower in ['friday', 'fri']:
-                target_date = self._get_next_weekday(4)
-            elif day_lower in ['saturday', 'sat']:
-                target_date = self._get_next_weekday(5)
-            elif day_lower in ['sunday', 'sun']:
-                target_date = self._get_next_weekday(6)
-            else:
-                # Try to parse as date
-                try:
-                    target_date = datetime.strptime(day, "%Y-%m-%d").date()
-                except:
-                    # If parsing fails, use today
-                    target_date = current_time.date()
-            
-            # Parse time
-            if time_lower in ['morning', 'am']:
-                target_time = datetime.strptime("09:00", "%H:%M").time()
-            elif time_lower in ['afternoon', 'pm']:
-                target_time = datetime.strptime("14:00", "%H:%M").time()
-            elif time_lower in ['evening', 'night']:
-                target_time = datetime.strptime("19:00", "%H:%M").time()
-            else:
-                # Try to parse as time
-                try:
-                    target_time = datetime.strptime(time, "%H:%M").time()
-                except:
-                    # Default to current time if parsing fails
-                    target_time = current_time.time()
+            current_time = now or self.get_current_montreal_time()
+            
+            # The parse only depends on the inputs and today's date, so it is
+            # memoized; an unparseable time falls back to the current time
+            target_date, target_time = _parse_datetime_cached(day, time, current_time.date())
+            if target_time is None:
+                target_time = current_time.time()
             
             # Combine date and time with Montreal timezone
             naive_datetime = datetime.combine(target_date, target_time)
-            return MONTREAL_TZ.localize(naive_datetime)
+            return _localize(naive_datetime)
             
         except Exception as e:
             logger.error(f"Error parsing datetime: {e}")
             return self.get_current_montreal_time()
     
-    def _get_next_weekday(self, weekday: int) -> datetime.date:
-        """Get the next occurrence of a weekday in Montreal timezone"""
-        today = self.get_current_montreal_time().date()
-        days_ahead = weekday - today.weekday()
-        if days_ahead <= 0:  # Target day already happened this week
-            days_ahead += 7
-        return today + timedelta(days=days_ahead)
-    
     def _is_festival_at_time(self, festival: Dict[str, Any], target_datetime: datetime) -> bool:
         """Check if festival is happening at the specified time with timezone awareness"""
         try:
-            # Parse festival dates with timezone awareness
-            start_date_str = festival['start_date'].replace('Z', '+00:00')
-            end_date_str = festival['end_date'].replace('Z', '+00:00')
-            
-            # Handle different date formats
-            if 'T' in start_date_str:
-                start_date = datetime.fromisoformat(start_date_str)
-            else:
-                start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-                start_date = MONTREAL_TZ.localize(start_date)
-            
-            if 'T' in end_date_str:
-                end_date = datetime.fromisoformat(end_date_str)
-            else:
-                end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-                end_date = MONTREAL_TZ.localize(end_date)
+            # Parsed festival dates are memoized on the raw strings
+            start_date, end_date = _parse_festival_window(festival['start_date'], festival['end_date'])
             
             # Ensure all datetimes are timezone-aware
-            if start_date.tzinfo is None:
-                start_date = MONTREAL_TZ.localize(start_date)
-            if end_date.tzinfo is None:
-                end_date = MONTREAL_TZ.localize(end_date)
             if target_datetime.tzinfo is None:
-                target_datetime = MONTREAL_TZ.localize(target_datetime)
+                target_datetime = _localize(target_datetime)
             
             # Check if festival is happening at the target time
             return start_date <= target_datetime <= end_date
@@ -194,10 +502,10 @@ class MontrealFestivalAssistant:
             logger.error(f"Error checking festival time: {e}")
             return False
     
-    def _is_festival_currently_ongoing(self, festival: Dict[str, Any]) -> bool:
+    def _is_festival_currently_ongoing(self, festival: Dict[str, Any], now: Optional[datetime] = None) -> bool:
         """Check if festival is currently ongoing"""
         try:
-            current_time = self.get_current_montreal_time()
+            current_time = now or self.get_current_montreal_time()
             return self._is_festival_at_time(festival, current_time)
         except Exception as e:
             logger.error(f"Error checking if festival is ongoing: {e}")
@@ -216,11 +524,17 @@ class MontrealFestivalAssistant:
         try:
             logger.info(f"Processing festival request: {user_input}")
             
+            # One clock reading for the whole request, so every festival is
+            # judged against the same moment
+            now = self.get_current_montreal_time()
+            
             # Parse input for category, day, time
-            category, day, time = self._parse_user_input(user_input)
+            category, day, time = self._parse_user_input(user_input, now)
             
-            # Get matching festivals from real APIs
-            matching_festivals = self.get_festivals_by_criteria(category, day, time)
+            # Get matching festivals from real APIs; one list for the whole
+            # request, so the ongoing check below sees the same festivals
+            festivals = get_ongoing_festivals()
+            matching_festivals = self.get_festivals_by_criteria(category, day, time, festivals)
             
             if not matching_festivals:
                 return {
@@ -230,11 +544,13 @@ class MontrealFestivalAssistant:
                     'data_source': 'Real-time APIs'
                 }
             
+            # Resolve which festivals are running with one binary search
+            # rather than a date check per festival
+            ongoing_ids = {id(festival) for festival in _get_festival_columns(festivals).ongoing_at(now)}
+            is_ongoing = [id(festival) in ongoing_ids for festival in matching_festivals]
+            
             # Generate real-time response for each matching festival
-            responses = []
-            for festival in matching_festivals:
-                response = self._generate_festival_response(festival)
-                responses.append(response)
+            responses = self._generate_festival_responses(matching_festivals, now, is_ongoing)
             
             final_response = "\n\n".join(responses)
             
@@ -260,144 +576,107 @@ class MontrealFestivalAssistant:
                 'final_response': error_response
             }
     
-    def _parse_user_input(self, user_input: str) -> tuple:
+    def _parse_user_input(self, user_input: str, now: Optional[datetime] = None) -> tuple:
         """Parse user input to extract category, day, and time"""
-        # Default values
-        category = "music"
-        day = "today"
-        time = "evening"
-        
-        # English keyword mapping
-        category_keywords = {
-            'music': ['music', 'concert', 'jazz', 'rock', 'pop'],
-            'film': ['film', 'movie', 'cinema', 'documentary'],
-            'food': ['food', 'culinary', 'wine', 'beer', 'taste'],
-            'art': ['art', 'exhibition', 'gallery', 'museum'],
-            'comedy': ['comedy', 'standup', 'humor'],
-            'dance': ['dance', 'ballet', 'performance']
-        }
-        
-        # English day keywords
-        day_keywords = {
-            'today': ['today', 'now'],
-            'tomorrow': ['tomorrow'],
-            'tonight': ['tonight'],
-            'monday': ['monday', 'mon'],
-            'tuesday': ['tuesday', 'tue'],
-            'wednesday': ['wednesday', 'wed'],
-            'thursday': ['thursday', 'thu'],
-            'friday': ['friday', 'fri'],
-            'saturday': ['saturday', 'sat'],
-            'sunday': ['sunday', 'sun']
-        }
-        
-        # English time keywords
-        time_keywords = {
-            'morning': ['morning', 'am'],
-            'afternoon': ['afternoon', 'pm'],
-            'evening': ['evening', 'night'],
-            'night': ['night']
-        }
-        
-        # Convert input to lowercase for processing
-        input_lower = user_input.lower()
-        words = input_lower.split()
-        
-        # Look for category keywords
-        found_category = False
-        for word in words:
-            for cat, keywords in category_keywords.items():
-                if word in keywords:
-                    category = cat
-                    found_category = True
-                    break
-            if found_category:
-                break
+        # Memoized on the normalized input; the current hour is part of the
+        # key because it decides the time when the input names none
+        category, day, time = _parse_user_input_cached(
+            user_input.lower().strip(), (now or self.get_current_montreal_time()).hour
+        )
         
-        # If no category found, try to infer from the input
-        if not found_category:
-            if any(word in input_lower for word in ['music', 'concert', 'jazz']):
-                category = 'music'
-            elif any(word in input_lower for word in ['food', 'culinary', 'restaurant']):
-                category = 'food'
-            elif any(word in input_lower for word in ['comedy', 'humor', 'standup']):
-                category = 'comedy'
-            elif any(word in input_lower for word in ['art', 'exhibition', 'gallery']):
-                category = 'art'
-            elif any(word in input_lower for word in ['dance', 'ballet']):
-                category = 'dance'
-            elif any(word in input_lower for word in ['film', 'movie', 'cinema']):
-                category = 'film'
+        logger.info(f"Parsed input: category='{category}', day='{day}', time='{time}'")
+        return category, day, time
+    
+    def _generate_festival_responses(self, festivals: List[Dict[str, Any]], now: datetime,
+                                     is_ongoing: List[bool]) -> List[str]:
+        """Generate the responses for several festivals with a single Gemini call"""
+        current_time_str = now.strftime("%Y-%m-%d %H:%M %Z")
+        hour = now.strftime("%Y-%m-%d %H")
         
-        # Look for day keywords
-        found_day = False
-        for word in words:
-            for day_name, keywords in day_keywords.items():
-                if word in keywords:
-                    day = day_name
-                    found_day = True
-                    break
-            if found_day:
-                break
+        responses = [None] * len(festivals)
+        batch = []       # (index, cache_key, prompt item) of uncached festivals
+        individual = []  # Indices answered with a call of their own
+        for i, festival in enumerate(festivals):
+            try:
+                cache_key = (festival['name'], festival['start_date'], festival['end_date'], is_ongoing[i], hour)
+                cached_response = _get_cached_response(cache_key)
+                if cached_response is not None:
+                    responses[i] = cached_response
+                    continue
+                item = _FESTIVAL_BATCH_ITEM_TEMPLATE.format_map({
+                    **_PROMPT_FIELD_DEFAULTS,
+                    **festival,
+                    'index': len(batch) + 1,
+                    'is_ongoing': is_ongoing[i]
+                })
+            except (KeyError, TypeError):
+                # Malformed festival; its own call reports the error for it
+                individual.append(i)
+                continue
+            batch.append((i, cache_key, item))
         
-        # Look for time keywords
-        found_time = False
-        for word in words:
-            for time_name, keywords in time_keywords.items():
-                if word in keywords:
-                    time = time_name
-                    found_time = True
-                    break
-            if found_time:
-                break
+        if len(batch) > 1:
+            # One prompt listing every uncached festival instead of one
+            # round-trip each; sent as-is, since execute_task's system prompt
+            # asks for a single-festival format
+            prompt = _FESTIVAL_BATCH_PROMPT_TEMPLATE.format(
+                count=len(batch), current_time=current_time_str,
+                festivals='\n'.join(item for _, _, item in batch)
+            )
+            result = execute_prompt(prompt)
+            
+            if result['status'] == 'success':
+                parts = [part.strip() for part in _BATCH_SEPARATOR_RE.split(result['response'])]
+                parts = [part for part in parts if part]
+                if len(parts) == len(batch):
+                    for (i, cache_key, _), part in zip(batch, parts):
+                        _store_cached_response(cache_key, part)
+                        responses[i] = part
+                    batch = []
+                else:
+                    logger.warning("Batched response had %d sections for %d festivals, retrying individually",
+                                   len(parts), len(batch))
         
-        # If no specific time found, try to infer from current time
-        if not found_time:
-            current_hour = self.get_current_montreal_time().hour
-            if 6 <= current_hour < 12:
-                time = 'morning'
-            elif 12 <= current_hour < 17:
-                time = 'afternoon'
-            elif 17 <= current_hour < 22:
-                time = 'evening'
-            else:
-                time = 'night'
+        individual.extend(i for i, _, _ in batch)
+        if individual:
+            # Single festival, malformed ones, or the batch failed: one call
+            # per festival, run concurrently and kept in order via map
+            individual.sort()
+            with ThreadPoolExecutor(max_workers=min(8, len(individual))) as executor:
+                results = executor.map(self._generate_festival_response,
+                                       [festivals[i] for i in individual], repeat(now),
+                                       [is_ongoing[i] for i in individual])
+                for i, response in zip(individual, results):
+                    responses[i] = response
         
-        logger.info(f"Parsed input: category='{category}', day='{day}', time='{time}'")
-        return category, day, time
+        return responses
     
-    def _generate_festival_response(self, festival: Dict[str, Any]) -> str:
+    def _generate_festival_response(self, festival: Dict[str, Any], now: Optional[datetime] = None,
+                                    is_ongoing: Optional[bool] = None) -> str:
         """Generate real-time response for a specific festival using API data with timezone awareness"""
         try:
-            current_time = self.get_current_montreal_time()
-            is_ongoing = self._is_festival_currently_ongoing(festival)
+            current_time = now or self.get_current_montreal_time()
+            if is_ongoing is None:
+                is_ongoing = self._is_festival_currently_ongoing(festival, current_time)
             
             # Format current time for display
             current_time_str = current_time.strftime("%Y-%m-%d %H:%M %Z")
             
+            # The answer only changes with the festival, its status and the
+            # hour, so reuse a recent one instead of calling Gemini again
+            cache_key = (festival['name'], festival['start_date'], festival['end_date'],
+                         is_ongoing, current_time.strftime("%Y-%m-%d %H"))
+            cached_response = _get_cached_response(cache_key)
+            if cached_response is not None:
+                return cached_response
+            
             # Use Gemini API with real festival data
-            prompt = f"""
-            Provide EXACT, CONCISE information for this Montreal festival:
-            
-            Festival: {festival['name']}
-            Venue: {festival['venue']}
-            Address: {festival['address']}
-            Dates: {festival['start_date']} to {festival['end_date']}
-            Category: {festival.get('category', 'N/A')}
-            Price: {festival.get('price', 'N/A')}
-            Metro: {festival.get('metro', 'N/A')}
-            Source: {festival['source']}
-            Current Montreal Time: {current_time_str}
-            Is Currently Ongoing: {is_ongoing}
-            
-            Provide ONLY 3 key points:
-            1. [Festival name and exact venue]
-            2. [Google Maps address for navigation]
-            3. [Cost estimation in CAD - tickets, transport, food]
-            
-            Keep each point under 20 words. Be specific and actionable.
-            Include current time context if relevant.
-            """
+            prompt = _FESTIVAL_PROMPT_TEMPLATE.format_map({
+                **_PROMPT_FIELD_DEFAULTS,
+                **festival,
+                'current_time': current_time_str,
+                'is_ongoing': is_ongoing
+            })
             
             result = execute_task(prompt, {
                 'location': 'Montreal, Canada',
@@ -408,6 +687,7 @@ class MontrealFestivalAssistant:
             })
             
             if result['status'] == 'success':
+                _store_cached_response(cache_key, result['response'])
                 return result['response']
             else:
                 # Fallback response using API data with timezone info
@@ -426,7 +706,7 @@ class MontrealFestivalAssistant:
                 
         except Exception as e:
             logger.error(f"Error generating festival response: {e}")
-            return f"Error getting information for {festival['name']}"
+            return f"Error getting information for {festival.get('name', 'this festival')}"
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get system status and statistics"""
@@ -446,6 +726,9 @@ def main():
         print("GOOGLE_API_KEY=your_api_key_here")
         return
     
+    # Warm up Gemini while the menu is shown; the assistant prefetches festivals
+    threading.Thread(target=warmup, daemon=True).start()
+    
     # Initialize the festival assistant
     assistant = MontrealFestivalAssistant()
     
@@ -472,7 +755,9 @@ def main():
             
             elif category == 'ongoing':
                 assistant.show_ongoing_festivals()
-                input("\nPress Enter to continue...")
+                assistant.prefetch_festivals()
+                while input("\nPress Enter to continue, or 'r' to refresh...").strip().lower() == 'r':
+                    assistant.show_ongoing_festivals(refresh=True)
                 continue
             
             elif category is None:
@@ -488,6 +773,9 @@ def main():
             
             # Show results
             assistant.ui.show_festival_results(result)
+            
+            # Refresh an expiring festival cache while the user reads
+            assistant.prefetch_festivals()
             input("\nPress Enter to continue...")
             
         except KeyboardInterrupt:
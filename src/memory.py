@@ -1,65 +1,276 @@
-import json
+import orjson
 import os
+import mmap
 import logging
+import atexit
+import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
+from collections import defaultdict
 import hashlib
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Events buffered before they are appended to the log; whatever is still
+# pending is written at exit or by flush()
+FLUSH_THRESHOLD = 64
+
+# One document per line, and str() dict keys as the json module did
+_ORJSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+# Write buffer of the open log file
+LOG_BUFFER_SIZE = 1 << 17
+
+# How hard writes are pushed to stable storage: 'none' leaves it to OS
+# writeback (fine for chat history), 'dsync' opens the log with O_DSYNC so
+# each flush is durable on return, 'fsync' syncs after every write
+DURABILITY_LEVELS = ('none', 'dsync', 'fsync')
+
+# Logged events after which the log is folded back into the snapshot
+COMPACT_THRESHOLD = 1024
+
+def _now_iso() -> str:
+    """Timestamp for a memory record; take it once per record, not per field"""
+    return datetime.now().isoformat()
+
+def _empty_memory() -> Dict[str, Any]:
+    """Return the memory layout for a new store"""
+    return {
+        'conversations': [],
+        'task_results': [],
+        'user_preferences': {},
+        'learned_patterns': {},
+        'metadata': {
+            'created_at': _now_iso(),
+            'version': '1.0'
+        }
+    }
+
+def _read_snapshot(path: str) -> Dict[str, Any]:
+    """Parse a snapshot file straight from a read-only mapping of it"""
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and non-regular files can't be mapped
+            return orjson.loads(f.read())
+        with mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
 class MemoryManager:
-    def __init__(self, memory_file: str = "agent_memory.json"):
+    __slots__ = ('memory_file', 'log_file', 'durability', 'memory_data',
+                 '_use_dsync', '_sync_writes', '_pending_events', '_logged_events',
+                 '_flush_threshold', '_log_fp', '_task_index', '_seq',
+                 '_conversations', '_task_results', '_user_preferences', '_learned_patterns')
+    
+    def __init__(self, memory_file: str = "agent_memory.json", flush_threshold: int = FLUSH_THRESHOLD,
+                 durability: str = 'none'):
         """
         Initialize the memory manager
         
+        Memory is kept as a JSON snapshot in memory_file plus an append-only
+        JSONL log of the changes made since (memory_file + '.log'), so a
+        store appends one line instead of rewriting the whole file.
+        
         Args:
             memory_file (str): Path to the memory storage file
+            flush_threshold (int): Events to buffer before appending to the log
+            durability (str): One of DURABILITY_LEVELS
         """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        
         self.memory_file = memory_file
+        self.log_file = memory_file + '.log'
+        self.durability = durability
+        
+        # Without O_DSYNC, 'dsync' falls back to syncing after each write
+        self._use_dsync = durability == 'dsync' and hasattr(os, 'O_DSYNC')
+        self._sync_writes = durability != 'none' and not self._use_dsync
+        
+        self._pending_events = []
+        self._logged_events = 0
+        self._flush_threshold = flush_threshold
+        
+        # Log file kept open between flushes; opened on first use
+        self._log_fp = None
+        
         self.memory_data = self._load_memory()
+        atexit.register(self.close)
+        
         logger.info(f"Memory manager initialized with file: {memory_file}")
     
     def _load_memory(self) -> Dict[str, Any]:
-        """Load memory from file"""
+        """Load the snapshot and replay the log on top of it"""
         try:
             if os.path.exists(self.memory_file):
-                with open(self.memory_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                self.memory_data = _read_snapshot(self.memory_file)
             else:
-                return {
-                    'conversations': [],
-                    'task_results': [],
-                    'user_preferences': {},
-                    'learned_patterns': [],
-                    'metadata': {
-                        'created_at': datetime.now().isoformat(),
-                        'version': '1.0'
-                    }
-                }
+                self.memory_data = _empty_memory()
         except Exception as e:
             logger.error(f"Error loading memory: {e}")
-            return {
-                'conversations': [],
-                'task_results': [],
-                'user_preferences': {},
-                'learned_patterns': [],
-                'metadata': {
-                    'created_at': datetime.now().isoformat(),
-                    'version': '1.0'
-                }
-            }
+            self.memory_data = _empty_memory()
+        
+        # Older files list the learned patterns; index them by type
+        patterns = self.memory_data.get('learned_patterns')
+        if isinstance(patterns, list):
+            by_type = {}
+            for pattern in patterns:
+                by_type.setdefault(pattern['type'], pattern)
+            self.memory_data['learned_patterns'] = by_type
+        
+        # Sequence number of the last event the snapshot already contains
+        self._seq = self.memory_data.setdefault('metadata', {}).get('seq', 0)
+        
+        self._bind_sections()
+        self._replay_log()
+        self._index_task_results()
+        return self.memory_data
+    
+    def _bind_sections(self):
+        """Keep direct references to the sections of memory_data"""
+        self._conversations = self.memory_data['conversations']
+        self._task_results = self.memory_data['task_results']
+        self._user_preferences = self.memory_data['user_preferences']
+        self._learned_patterns = self.memory_data['learned_patterns']
+    
+    def _replay_log(self):
+        """Apply the events logged since the last snapshot"""
+        if not os.path.exists(self.log_file):
+            return
+        
+        try:
+            with open(self.log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        event = orjson.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted append
+                        logger.warning("Skipping unreadable memory log entry")
+                        continue
+                    
+                    # Events up to the snapshot's sequence number are already
+                    # in it, left over when a compaction stopped before the
+                    # log was truncated; older logs carry no numbers at all
+                    seq = event.get('seq')
+                    if seq is not None:
+                        if seq <= self._seq:
+                            continue
+                        self._seq = seq
+                    self._apply_event(event)
+                    self._logged_events += 1
+        except Exception as e:
+            logger.error(f"Error replaying memory log: {e}")
+    
+    def _apply_event(self, event: Dict[str, Any]):
+        """Apply one logged event to memory_data"""
+        kind = event['kind']
+        if kind == 'conversation':
+            self._conversations.append(event['record'])
+        elif kind == 'task_result':
+            self._task_results.append(event['record'])
+        elif kind == 'pref':
+            self._user_preferences[event['key']] = event['record']
+        elif kind == 'pattern':
+            self._apply_pattern(event['type'], event['data'], event['timestamp'])
+        else:
+            logger.warning(f"Unknown memory log event: {kind}")
+    
+    def _index_task_results(self):
+        """Rebuild the word -> task result positions index used by recall"""
+        self._task_index = defaultdict(set)
+        for position, task_record in enumerate(self._task_results):
+            self._index_task_result(position, task_record)
+    
+    def _index_task_result(self, position: int, task_record: Dict[str, Any]):
+        """Add one task result's description words to the index"""
+        for word in task_record['task_description'].lower().split():
+            self._task_index[word].add(position)
     
     def _save_memory(self):
-        """Save memory to file"""
+        """Write a full snapshot and start a new, empty log"""
         try:
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(self.memory_data, f, indent=2, ensure_ascii=False)
+            # Record the last event the snapshot covers, so replay can tell
+            # which log entries it already contains
+            self.memory_data['metadata']['seq'] = self._seq
+            
+            # Write to a temporary file first so a crash never leaves a
+            # half-written snapshot behind
+            temp_file = self.memory_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(orjson.dumps(self.memory_data, option=_ORJSON_OPTIONS))
+                if self.durability != 'none':
+                    # The data must be on disk before the rename makes it current
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_file, self.memory_file)
+            
+            # The snapshot includes everything logged or pending; if the
+            # truncation below never happens, replay skips those events
+            self._close_log()
+            open(self.log_file, 'w').close()
+            self._pending_events.clear()
+            self._logged_events = 0
             logger.info("Memory saved successfully")
         except Exception as e:
             logger.error(f"Error saving memory: {e}")
     
+    def _append_event(self, event: Dict[str, Any]):
+        """Queue an event for the log, appending once enough have accumulated"""
+        self._seq += 1
+        event['seq'] = self._seq
+        self._pending_events.append(event)
+        if len(self._pending_events) >= self._flush_threshold:
+            self.flush()
+    
+    def flush(self):
+        """Append pending events to the memory log"""
+        if not self._pending_events:
+            return
+        
+        try:
+            if self._log_fp is None:
+                self._log_fp = self._open_log()
+            # Events collect in the file's buffer and go out in one write
+            self._log_fp.writelines(orjson.dumps(event, option=_ORJSON_OPTIONS) for event in self._pending_events)
+            self._log_fp.flush()
+            if self._sync_writes:
+                os.fsync(self._log_fp.fileno())
+            self._logged_events += len(self._pending_events)
+            self._pending_events.clear()
+        except Exception as e:
+            logger.error(f"Error appending to memory log: {e}")
+            return
+        
+        # Fold a long log back into the snapshot so loading stays fast
+        if self._logged_events >= COMPACT_THRESHOLD:
+            self.compact()
+    
+    def _open_log(self):
+        """Open the log for buffered appends, with O_DSYNC if requested"""
+        if not self._use_dsync:
+            return open(self.log_file, 'ab', buffering=LOG_BUFFER_SIZE)
+        
+        fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_DSYNC, 0o666)
+        return os.fdopen(fd, 'ab', buffering=LOG_BUFFER_SIZE)
+    
+    def close(self):
+        """Flush pending events and close the log file"""
+        self.flush()
+        self._close_log()
+    
+    def _close_log(self):
+        """Close the log file if it is open"""
+        if self._log_fp is not None:
+            log_fp, self._log_fp = self._log_fp, None
+            log_fp.close()
+    
+    def compact(self):
+        """Rewrite the snapshot from memory and truncate the log"""
+        self._save_memory()
+    
     def store_conversation(self, user_input: str, agent_response: str, 
                           task_results: Optional[List[Dict]] = None):
         """
@@ -71,15 +282,15 @@ class MemoryManager:
             task_results (List[Dict], optional): Results from task execution
         """
         conversation = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_iso(),
             'user_input': user_input,
             'agent_response': agent_response,
             'task_results': task_results or [],
             'id': self._generate_id(user_input + agent_response)
         }
         
-        self.memory_data['conversations'].append(conversation)
-        self._save_memory()
+        self._conversations.append(conversation)
+        self._append_event({'kind': 'conversation', 'record': conversation})
         logger.info(f"Stored conversation with ID: {conversation['id']}")
     
     def store_task_result(self, task_description: str, result: Dict[str, Any]):
@@ -91,14 +302,15 @@ class MemoryManager:
             result (Dict[str, Any]): Task execution result
         """
         task_record = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_iso(),
             'task_description': task_description,
             'result': result,
             'id': self._generate_id(task_description)
         }
         
-        self.memory_data['task_results'].append(task_record)
-        self._save_memory()
+        self._task_results.append(task_record)
+        self._index_task_result(len(self._task_results) - 1, task_record)
+        self._append_event({'kind': 'task_result', 'record': task_record})
         logger.info(f"Stored task result for: {task_description}")
     
     def store_user_preference(self, key: str, value: Any):
@@ -109,11 +321,12 @@ class MemoryManager:
             key (str): Preference key
             value (Any): Preference value
         """
-        self.memory_data['user_preferences'][key] = {
+        preference = {
             'value': value,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _now_iso()
         }
-        self._save_memory()
+        self._user_preferences[key] = preference
+        self._append_event({'kind': 'pref', 'key': key, 'record': preference})
         logger.info(f"Stored user preference: {key} = {value}")
     
     def recall_conversations(self, limit: int = 5) -> List[Dict]:
@@ -126,7 +339,7 @@ class MemoryManager:
         Returns:
             List[Dict]: Recent conversations
         """
-        conversations = self.memory_data['conversations']
+        conversations = self._conversations
         return conversations[-limit:] if conversations else []
     
     def recall_task_results(self, task_keyword: str = None, limit: int = 10) -> List[Dict]:
@@ -140,17 +353,48 @@ class MemoryManager:
         Returns:
             List[Dict]: Task results
         """
-        results = self.memory_data['task_results']
+        results = self._task_results
         
         if task_keyword:
-            filtered_results = [
-                result for result in results 
-                if task_keyword.lower() in result['task_description'].lower()
-            ]
-        else:
-            filtered_results = results
+            keyword = task_keyword.lower()
+            candidates = self._task_candidates(keyword)
+            if candidates is None:
+                candidates = range(len(results))
+            
+            # Newest first, stopping once enough matches are found; the index
+            # only narrows the search, the substring test decides
+            filtered_results = []
+            for position in sorted(candidates, reverse=True):
+                if keyword in results[position]['task_description'].lower():
+                    filtered_results.append(results[position])
+                    if len(filtered_results) == limit:
+                        break
+            filtered_results.reverse()
+            return filtered_results
         
-        return filtered_results[-limit:] if filtered_results else []
+        return results[-limit:] if results else []
+    
+    def _task_candidates(self, keyword: str) -> Optional[Set[int]]:
+        """
+        Positions of the task results that may contain keyword
+        
+        Intersects the index entries of the keyword's whitespace-separated
+        parts. A part that is not an indexed word falls back to the words
+        containing it, since it may sit inside one ('fest' in 'festival').
+        Returns None when the keyword has no parts.
+        """
+        candidates = None
+        for part in keyword.split():
+            postings = self._task_index.get(part)
+            if postings is None:
+                postings = set()
+                for word, positions in self._task_index.items():
+                    if part in word:
+                        postings |= positions
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                break
+        return candidates
     
     def get_user_preferences(self) -> Dict[str, Any]:
         """
@@ -159,7 +403,7 @@ class MemoryManager:
         Returns:
             Dict[str, Any]: User preferences
         """
-        return self.memory_data['user_preferences']
+        return self._user_preferences
     
     def get_user_preference(self, key: str, default: Any = None) -> Any:
         """
@@ -172,7 +416,7 @@ class MemoryManager:
         Returns:
             Any: Preference value
         """
-        preferences = self.memory_data['user_preferences']
+        preferences = self._user_preferences
         if key in preferences:
             return preferences[key]['value']
         return default
@@ -185,29 +429,28 @@ class MemoryManager:
             pattern_type (str): Type of pattern
             pattern_data (Dict[str, Any]): Pattern data
         """
-        pattern = {
-            'type': pattern_type,
-            'data': pattern_data,
-            'timestamp': datetime.now().isoformat(),
-            'frequency': 1
-        }
-        
-        # Check if pattern already exists
-        existing_patterns = [
-            p for p in self.memory_data['learned_patterns'] 
-            if p['type'] == pattern_type
-        ]
+        timestamp = _now_iso()
+        self._apply_pattern(pattern_type, pattern_data, timestamp)
+        self._append_event({'kind': 'pattern', 'type': pattern_type, 'data': pattern_data, 'timestamp': timestamp})
+        logger.info(f"Learned pattern: {pattern_type}")
+    
+    def _apply_pattern(self, pattern_type: str, pattern_data: Dict[str, Any], timestamp: str):
+        """Add a learned pattern, or merge it into the existing one of its type"""
+        patterns = self._learned_patterns
+        existing_pattern = patterns.get(pattern_type)
         
-        if existing_patterns:
+        if existing_pattern:
             # Update existing pattern
-            existing_patterns[0]['frequency'] += 1
-            existing_patterns[0]['data'].update(pattern_data)
+            existing_pattern['frequency'] += 1
+            existing_pattern['data'].update(pattern_data)
         else:
             # Add new pattern
-            self.memory_data['learned_patterns'].append(pattern)
-        
-        self._save_memory()
-        logger.info(f"Learned pattern: {pattern_type}")
+            patterns[pattern_type] = {
+                'type': pattern_type,
+                'data': dict(pattern_data),
+                'timestamp': timestamp,
+                'frequency': 1
+            }
     
     def get_learned_patterns(self, pattern_type: str = None) -> List[Dict]:
         """
@@ -219,29 +462,26 @@ class MemoryManager:
         Returns:
             List[Dict]: Learned patterns
         """
-        patterns = self.memory_data['learned_patterns']
+        patterns = self._learned_patterns
         
         if pattern_type:
-            return [p for p in patterns if p['type'] == pattern_type]
+            return [patterns[pattern_type]] if pattern_type in patterns else []
         
-        return patterns
+        return list(patterns.values())
     
     def _generate_id(self, content: str) -> str:
         """Generate a unique ID for content"""
-        return hashlib.md5(content.encode()).hexdigest()[:8]
+        # Same 8 hex digits as before, from a 4-byte BLAKE2b digest rather than
+        # a truncated MD5 one
+        return hashlib.blake2b(content.encode(), digest_size=4).hexdigest()
     
     def clear_memory(self):
         """Clear all memory data"""
-        self.memory_data = {
-            'conversations': [],
-            'task_results': [],
-            'user_preferences': {},
-            'learned_patterns': [],
-            'metadata': {
-                'created_at': datetime.now().isoformat(),
-                'version': '1.0'
-            }
-        }
+        self.memory_data = _empty_memory()
+        self._bind_sections()
+        self._index_task_results()
+        
+        # Write through so the old data is gone from disk immediately
         self._save_memory()
         logger.info("Memory cleared")
     
@@ -253,21 +493,27 @@ class MemoryManager:
             Dict[str, Any]: Memory statistics
         """
         return {
-            'total_conversations': len(self.memory_data['conversations']),
-            'total_task_results': len(self.memory_data['task_results']),
-            'total_user_preferences': len(self.memory_data['user_preferences']),
-            'total_learned_patterns': len(self.memory_data['learned_patterns']),
-            'memory_size_mb': os.path.getsize(self.memory_file) / (1024 * 1024) if os.path.exists(self.memory_file) else 0
+            'total_conversations': len(self._conversations),
+            'total_task_results': len(self._task_results),
+            'total_user_preferences': len(self._user_preferences),
+            'total_learned_patterns': len(self._learned_patterns),
+            'memory_size_mb': sum(
+                os.path.getsize(path) for path in (self.memory_file, self.log_file) if os.path.exists(path)
+            ) / (1024 * 1024)
         }
 
 # Global memory manager instance
 memory_manager = None
+_memory_manager_lock = threading.Lock()
 
 def get_memory_manager() -> MemoryManager:
     """Get or create the global memory manager instance"""
     global memory_manager
     if memory_manager is None:
-        memory_manager = MemoryManager()
+        # Concurrent first callers must not each build a manager over the same files
+        with _memory_manager_lock:
+            if memory_manager is None:
+                memory_manager = MemoryManager()
     return memory_manager
 
 def store_conversation(user_input: str, agent_response: str, task_results: Optional[List[Dict]] = None):
@@ -278,6 +524,10 @@ def store_task_result(task_description: str, result: Dict[str, Any]):
     """Convenience function to store a task result"""
     get_memory_manager().store_task_result(task_description, result)
 
+def flush_memory():
+    """Convenience function to write pending memory to disk"""
+    get_memory_manager().flush()
+
 def recall_conversations(limit: int = 5) -> List[Dict]:
     """Convenience function to recall conversations"""
     return get_memory_manager().recall_conversations(limit)
@@ -1,5 +1,9 @@
 import logging
-from typing import List, Dict, Any
+import re
+import heapq
+import threading
+from typing import List, Dict, Any, Tuple
+from collections import defaultdict
 from executor import execute_task
 from memory import recall_conversations, recall_task_results, get_user_preferences
 
@@ -7,7 +11,19 @@ from memory import recall_conversations, recall_task_results, get_user_preferenc
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request intents: the listed words and their inflections ('finding',
+# 'recommendations'), matched in one scan; each named group is an intent
+_INTENT_RE = re.compile(
+    r'\b(?:'
+    r'(?P<search>search(?:es|ing|ed)?|find(?:s|ings?)?|lookups?)'
+    r'|(?P<analyze>analy[sz](?:e|es|ed|ing)|examin(?:e|es|ed|ing))'
+    r'|(?P<recommend>recommend(?:s|ing|ed|ations?)?|suggest(?:s|ing|ed|ions?)?|advi(?:se|ses|sed|sing|ce))'
+    r')\b'
+)
+
 class TaskPlanner:
+    __slots__ = ()
+    
     def __init__(self):
         """Initialize the task planner"""
         logger.info("Task planner initialized")
@@ -100,9 +116,9 @@ class TaskPlanner:
         tasks = []
         
         # Analyze user input for common patterns
-        input_lower = user_input.lower()
+        intents = {match.lastgroup for match in _INTENT_RE.finditer(user_input.lower())}
         
-        if 'search' in input_lower or 'find' in input_lower:
+        if 'search' in intents:
             tasks.append({
                 'id': 'search_task',
                 'description': f'Search for information related to: {user_input}',
@@ -113,7 +129,7 @@ class TaskPlanner:
                 'success_criteria': 'Relevant information found and presented'
             })
         
-        if 'analyze' in input_lower or 'analyze' in input_lower:
+        if 'analyze' in intents:
             tasks.append({
                 'id': 'analysis_task',
                 'description': f'Analyze the provided information: {user_input}',
@@ -124,7 +140,7 @@ class TaskPlanner:
                 'success_criteria': 'Comprehensive analysis completed'
             })
         
-        if 'recommend' in input_lower or 'suggest' in input_lower:
+        if 'recommend' in intents:
             tasks.append({
                 'id': 'recommendation_task',
                 'description': f'Generate recommendations based on: {user_input}',
@@ -179,8 +195,10 @@ class TaskPlanner:
         Returns:
             List[Dict[str, Any]]: Prioritized task list
         """
-        # Sort by priority (lower number = higher priority)
-        return sorted(tasks, key=lambda x: x.get('priority', 999))
+        ordered, problems = self._order_tasks(tasks)
+        for problem in problems:
+            logger.warning(problem)
+        return ordered
     
     def validate_task_dependencies(self, tasks: List[Dict[str, Any]]) -> bool:
         """
@@ -192,25 +210,78 @@ class TaskPlanner:
         Returns:
             bool: True if dependencies are valid
         """
-        task_ids = {task['id'] for task in tasks}
+        _, problems = self._order_tasks(tasks)
+        for problem in problems:
+            logger.warning(problem)
+        return not problems
+    
+    def _order_tasks(self, tasks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Order tasks after their dependencies, lowest priority number first
+        
+        A topological sort (Kahn's algorithm) whose ready set is a heap keyed
+        on (priority, original position), so without dependencies this is
+        the stable sort by priority. Missing dependencies are ignored and
+        tasks caught in a cycle go last, by priority.
+        
+        Args:
+            tasks (List[Dict[str, Any]]): List of tasks
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], List[str]]: Ordered tasks and the
+            dependency problems found
+        """
+        positions_by_id = defaultdict(list)
+        for position, task in enumerate(tasks):
+            positions_by_id[task['id']].append(position)
+        
+        problems = []
+        dependents = defaultdict(list)
+        waiting_on = [0] * len(tasks)
+        
+        for position, task in enumerate(tasks):
+            for dep in set(task.get('dependencies', [])):
+                if dep not in positions_by_id:
+                    problems.append(f"Task {task['id']} depends on {dep} which doesn't exist")
+                    continue
+                for dep_position in positions_by_id[dep]:
+                    dependents[dep_position].append(position)
+                    waiting_on[position] += 1
+        
+        ready = [
+            (task.get('priority', 999), position)
+            for position, task in enumerate(tasks) if not waiting_on[position]
+        ]
+        heapq.heapify(ready)
+        
+        ordered = []
+        while ready:
+            _, position = heapq.heappop(ready)
+            ordered.append(tasks[position])
+            for dependent in dependents[position]:
+                waiting_on[dependent] -= 1
+                if not waiting_on[dependent]:
+                    heapq.heappush(ready, (tasks[dependent].get('priority', 999), dependent))
         
-        for task in tasks:
-            dependencies = task.get('dependencies', [])
-            for dep in dependencies:
-                if dep not in task_ids:
-                    logger.warning(f"Task {task['id']} depends on {dep} which doesn't exist")
-                    return False
+        if len(ordered) < len(tasks):
+            blocked = [tasks[position] for position, waiting in enumerate(waiting_on) if waiting]
+            problems.append(f"Circular dependencies between tasks: {', '.join(task['id'] for task in blocked)}")
+            ordered.extend(sorted(blocked, key=lambda x: x.get('priority', 999)))
         
-        return True
+        return ordered, problems
 
 # Global planner instance
 planner = None
+_planner_lock = threading.Lock()
 
 def get_planner() -> TaskPlanner:
     """Get or create the global planner instance"""
     global planner
     if planner is None:
-        planner = TaskPlanner()
+        # Concurrent first callers must share one planner
+        with _planner_lock:
+            if planner is None:
+                planner = TaskPlanner()
     return planner
 
 def plan(user_input: str) -> List[Dict[str, Any]]: